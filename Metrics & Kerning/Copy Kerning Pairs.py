@@ -7,23 +7,393 @@ __doc__ = """
 """
 
 import vanilla
-from GlyphsApp import Glyphs, GSLowercase
+from vanilla.dialogs import getFile
+from GlyphsApp import Glyphs, GSLowercase, UPDATEINTERFACE
+from AppKit import NSDictionary, NSPasteboard, NSPasteboardTypeString
+import codecs
+import csv
+import json
+import os
 import re
-
+import sys
 try:
-	f = Glyphs.font
-	# For Group validation in check text
-	groups1 = []
-	groups2 = []
-	for g in f.glyphs:
-		if g.rightKerningGroup:
-			if not "@" + g.rightKerningGroup in groups1:
-				groups1.append("@" + g.rightKerningGroup)
-		if g.leftKerningGroup:
-			if not "@" + g.leftKerningGroup in groups2:
-				groups2.append("@" + g.leftKerningGroup)
-except:
-	pass
+	import numpy
+except ImportError:
+	numpy = None  # scaleKerningValues falls back to plain Python
+scriptFolder = os.path.dirname(os.path.abspath(__file__))  # kerningChanges.py is next to this script
+if scriptFolder not in sys.path:
+	sys.path.append(scriptFolder)
+from kerningChanges import KerningChangeSet
+
+f = Glyphs.font
+
+# Preset definitions. PresetCompiler turns them into source -> destination glyph name maps for the current font.
+# They are kept in the .json file next to this script, read on first use and kept for the rest of the session:
+# suffixFamilies: suffix families, in order of preference. The first suffix that exists in the font wins.
+# caseExceptions: capitalised names that str.capitalize() gets wrong.
+# letterPresets: letter presets, in the order of the Letter popup.
+#   suffixes: destination glyphs are the glyphs of these categories whose names contain one of them (lowercase: all lowercase letters instead).
+#   The source name is the destination name without the suffix, capitalised for letters if capitalize is set.
+#   symbols: suffix family whose punctuation and symbols are added to the map.
+#   punctuation: copies between the mapped glyphs and the regular punctuation instead of between the mapped glyphs themselves.
+# numeralPresets: numeral presets, in the order of the Numeral popups.
+#   symbols: suffix family whose punctuation and symbols come along. fraction: no symbols are copied if either side is a fraction figure.
+presetTables = None
+
+
+def loadPresetTables():
+	global presetTables
+	if presetTables is None:
+		path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Copy Kerning Pairs.json")
+		with open(path) as tableFile:
+			presetTables = json.load(tableFile)
+	return presetTables
+
+
+NUMERALS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+class PresetCompiler(object):
+	# Compiles the preset definitions above against one font.
+	# The glyph names are read in a single pass, and every compiled map is memoized until invalidate() is called.
+	# Interface updates only mark the maps unverified. Before they are used again, the glyph names, categories, cases
+	# and kerning groups are read and compared with the ones they were compiled from, and dropped only if they differ.
+	def __init__(self, font):
+		self.font = font
+		self.verified = True
+		self.invalidate()
+
+	def invalidate(self, sender=None):
+		self.glyphNames = None
+		self.signature = None  # [(glyphName, category, case, leftGroup, rightGroup), ...] the maps were compiled from
+		self.compiled = {}
+
+	def unverify(self, sender=None):
+		self.verified = False
+
+	def glyphSignature(self):
+		return [(g.name, g.category, g.case, g.leftKerningGroup, g.rightKerningGroup) for g in self.font.glyphs]
+
+	def _scan(self):
+		signature = None
+		if not self.verified:
+			self.verified = True
+			if self.glyphNames is not None:
+				signature = self.glyphSignature()
+				if signature == self.signature:
+					return
+				self.invalidate()
+		if self.glyphNames is not None:
+			return
+		self.signature = signature if signature is not None else self.glyphSignature()
+		self.glyphNames = set()
+		self.byCategory = {}  # byCategory[category] = [glyphName, ...]
+		self.lowercase = []
+		self.kerningKeys = {}  # kerningKeys[glyphName] = (key on the left side, key on the right side)
+		self.symbols = []  # punctuation and symbol glyphs
+		for glyphName, category, case, leftGroup, rightGroup in self.signature:
+			self.glyphNames.add(glyphName)
+			if category == "Punctuation" or category == "Symbol":
+				self.symbols.append(glyphName)
+			self.kerningKeys[glyphName] = (
+				"@MMK_L_" + rightGroup if rightGroup else glyphName,
+				"@MMK_R_" + leftGroup if leftGroup else glyphName,
+			)
+			self.byCategory.setdefault(category, []).append(glyphName)
+			if category == "Letter" and case == GSLowercase:
+				self.lowercase.append(glyphName)
+
+	def pairKey(self, name, left):
+		# kerning key for a pair field: "@A" is a group name, a glyph name is replaced by its group, "" stays "" (Any)
+		if name.startswith("@"):
+			return ("@MMK_L_" if left else "@MMK_R_") + name[1:]
+		if name == "":
+			return ""
+		keyL, keyR = self.keysFor(name)
+		key = keyL if left else keyR
+		return key if key is not None else name
+
+	def keysFor(self, name):
+		# the kerning keys a glyph is kerned with, i.e. its groups if it has them. (None, None) for missing glyphs
+		self._scan()
+		return self.kerningKeys.get(name, (None, None))
+
+	def suffixed(self, name, family):
+		# the first existing variant of name in the suffix family, or None
+		for suffix in loadPresetTables()["suffixFamilies"][family]:
+			if name + suffix in self.glyphNames:
+				return name + suffix
+		return None
+
+	def capitalized(self, name):
+		name = name.capitalize()
+		return loadPresetTables()["caseExceptions"].get(name, name)
+
+	def symbolMap(self, family):
+		self._scan()
+		key = ("symbols", family)
+		if key not in self.compiled:
+			symbolMap = {}
+			for name in self.symbols:
+				variant = self.suffixed(name, family)
+				if variant is not None and variant != name:
+					symbolMap[name] = variant
+			self.compiled[key] = symbolMap
+		return self.compiled[key]
+
+	def symbolKeys(self):
+		# kerning keys of all punctuation and symbols, as ({leftKey: leftKey}, {rightKey: rightKey})
+		self._scan()
+		key = ("symbolKeys",)
+		if key not in self.compiled:
+			symbolL = {}
+			symbolR = {}
+			for name in self.symbols:
+				keyL, keyR = self.kerningKeys[name]
+				symbolL[keyL] = keyL
+				symbolR[keyR] = keyR
+			self.compiled[key] = (symbolL, symbolR)
+		return self.compiled[key]
+
+	def letterMap(self, presetIndex):
+		self._scan()
+		key = ("letter", presetIndex)
+		if key not in self.compiled:
+			preset = loadPresetTables()["letterPresets"][presetIndex]
+			letterMap = {}
+			for category in preset["categories"]:
+				if preset.get("lowercase"):
+					destinations = self.lowercase
+				else:
+					destinations = [name for name in self.byCategory.get(category, []) if any(suffix in name for suffix in preset["suffixes"])]
+				for destination in destinations:
+					source = destination
+					for suffix in preset.get("suffixes", []):
+						source = source.replace(suffix, "")
+					if preset.get("capitalize") and category == "Letter":
+						source = self.capitalized(source)
+					if source in self.glyphNames:
+						letterMap[source] = destination
+			if preset.get("symbols"):
+				letterMap.update(self.symbolMap(preset["symbols"]))
+			self.compiled[key] = letterMap
+		return self.compiled[key]
+
+	def numeralMap(self, sourceIndex, destinationIndex):
+		self._scan()
+		key = ("numeral", sourceIndex, destinationIndex)
+		if key not in self.compiled:
+			source = loadPresetTables()["numeralPresets"][sourceIndex]
+			destination = loadPresetTables()["numeralPresets"][destinationIndex]
+			numeralMap = {}
+			for numeral in NUMERALS:
+				sourceName = self.suffixed(numeral, source["family"])
+				destinationName = self.suffixed(numeral, destination["family"])
+				if sourceName is not None and destinationName is not None:
+					numeralMap[sourceName] = destinationName
+			if not (source.get("fraction") or destination.get("fraction")):
+				symbols = destination.get("symbols") or source.get("symbols")
+				if symbols:
+					numeralMap.update(self.symbolMap(symbols))
+			self.compiled[key] = numeralMap
+		return self.compiled[key]
+
+
+def scaleKerningValues(values, scale, skip):
+	# Scales and rounds a list of kerning values in one step.
+	# Values whose scaled amount is smaller than skip units become None.
+	if not values:
+		return []
+	if numpy is not None:
+		scaled = numpy.asarray(values, dtype=float) * scale
+		keep = numpy.trunc(numpy.abs(scaled)) >= skip
+		rounded = numpy.rint(scaled).astype(int)
+		return numpy.where(keep, rounded, None).tolist()
+	scaledValues = []
+	for value in values:
+		scaled = float(value) * scale
+		scaledValues.append(int(round(scaled)) if int(abs(scaled)) >= skip else None)
+	return scaledValues
+
+
+def masterScales(scaleText, masterScaleText, masters):
+	# {masterID: scale factor}. masterScaleText lists one percentage per master in master order, and overrides scaleText
+	if masterScaleText.strip():
+		percentages = [float(x) for x in re.split("[,; ]+", masterScaleText.strip())]
+		if len(percentages) != len(masters):
+			raise ValueError("%s per-master scales given for %s masters" % (len(percentages), len(masters)))
+	else:
+		percentages = [float(scaleText)] * len(masters)
+	return dict((m.id, percentage / 100) for m, percentage in zip(masters, percentages))
+
+
+class PrefixIndex(object):
+	# character trie over names, so a typed prefix can be completed without scanning every name
+	def __init__(self, names=()):
+		self.root = {}
+		for name in names:
+			self.add(name)
+
+	def add(self, name):
+		node = self.root
+		for char in name:
+			node = node.setdefault(char, {})
+		node[None] = name  # None marks the end of a name
+
+	def startingWith(self, prefix, limit=50):
+		node = self.root
+		for char in prefix:
+			if char not in node:
+				return []
+			node = node[char]
+		results = []
+		stack = [node]
+		while stack and len(results) < limit:
+			node = stack.pop()
+			if None in node:
+				results.append(node[None])
+			stack.extend(node[char] for char in sorted((k for k in node if k is not None), reverse=True))
+		return results
+
+
+class KerningNameRegistry(object):
+	# For validating and completing the pair fields.
+	# Glyph names and "@group" names are kept in sets, so checking a name is a single lookup.
+	# leftNames are valid on the left side of a pair (right groups), rightNames on the right side (left groups).
+	# Interface updates only mark it unverified. Before it is used again, the glyph names and groups are read and compared
+	# with the ones it was built from, and the sets and prefix indexes are rebuilt only if they differ.
+	def __init__(self, font):
+		self.font = font
+		self.signature = None  # [(glyphName, leftGroup, rightGroup), ...] the registry was built from
+		self.verified = False
+
+	def unverify(self, sender=None):
+		self.verified = False
+
+	def verify(self):
+		if self.verified:
+			return
+		self.verified = True
+		signature = [(g.name, g.leftKerningGroup, g.rightKerningGroup) for g in self.font.glyphs]
+		if signature == self.signature:
+			return
+		self.signature = signature
+		self.glyphNames = set()
+		self.leftGroups = set()
+		self.rightGroups = set()
+		for glyphName, leftGroup, rightGroup in signature:
+			self.glyphNames.add(glyphName)
+			if rightGroup:
+				self.leftGroups.add("@" + rightGroup)
+			if leftGroup:
+				self.rightGroups.add("@" + leftGroup)
+		self.leftIndex = PrefixIndex(self.glyphNames | self.leftGroups)
+		self.rightIndex = PrefixIndex(self.glyphNames | self.rightGroups)
+
+	def isValid(self, name, left):
+		self.verify()
+		if name in self.glyphNames:
+			return True
+		if left:
+			return name in self.leftGroups
+		return name in self.rightGroups
+
+	def completions(self, prefix, left, limit=50):
+		self.verify()
+		if left:
+			return self.leftIndex.startingWith(prefix, limit)
+		return self.rightIndex.startingWith(prefix, limit)
+
+
+class KerningIndex(object):
+	# Hashed view of one master's kerning, so presets look up matching pairs instead of scanning all of them.
+	# There is one store, rights[left][right] = value. The lookup by right side is derived from it on first use
+	# and only holds keys: lefts[right] = [left, ...]
+	def __init__(self, pairList):
+		self.rights = {}
+		self.lefts = None
+		for left, right, value in pairList:
+			self.rights.setdefault(left, {})[right] = value
+
+	def __len__(self):
+		return sum(len(leftRights) for leftRights in self.rights.values())
+
+	def items(self):
+		for left, leftRights in self.rights.items():
+			for right, value in leftRights.items():
+				yield left, right, value
+
+	def value(self, left, right):
+		return self.rights.get(left, {}).get(right)
+
+	def pairsWithLeft(self, left):
+		return list(self.rights.get(left, {}).items())
+
+	def pairsWithRight(self, right):
+		if self.lefts is None:
+			self.lefts = {}
+			for left, leftRights in self.rights.items():
+				for key in leftRights:
+					self.lefts.setdefault(key, []).append(left)
+		return [(left, self.rights[left][right]) for left in self.lefts.get(right, [])]
+
+	def pairsBetween(self, lefts, rights):
+		# yields (left, right, value) for every existing pair whose left is in lefts and right is in rights
+		for left in lefts:
+			for right, value in self.rights.get(left, {}).items():
+				if right in rights:
+					yield left, right, value
+
+
+def masterKerningPairs(kernDic, mID):
+	# yields (left, right, value) tuples of one master straight from the font's kerning dictionary
+	masterKern = kernDic.get(mID)
+	if masterKern is None:
+		return
+	for key1 in masterKern.allKeys():
+		leftKernDict = masterKern[key1]
+		for key2 in leftKernDict.allKeys():
+			yield key1, key2, leftKernDict[key2]
+
+
+class KerningSnapshotCache(object):
+	# KerningIndex per font and master, kept between Run clicks.
+	# Interface updates only mark the snapshots as unverified, since most of them have nothing to do with kerning.
+	# Before the snapshots are used again, each master's kerning is compared with a copy taken when its index was built.
+	# The comparison is one native dictionary comparison per master, and only the masters whose kerning changed are rebuilt.
+	def __init__(self):
+		self.font = None
+		self.indexes = {}  # indexes[masterID] = KerningIndex
+		self.copies = {}  # copies[masterID] = copy of the master's kerning dictionary the index was built from
+		self.verified = True
+
+	def invalidate(self, sender=None):
+		self.indexes = {}
+		self.copies = {}
+
+	def unverify(self, sender=None):
+		self.verified = False
+
+	def kernIndex(self, font):
+		# returns {masterID: KerningIndex}, only rebuilding the masters that are not cached or whose kerning changed
+		if font is not self.font:
+			self.font = font
+			self.invalidate()
+		if Glyphs.versionNumber >= 3.0:
+			kernDic = font.kerningDictForDirection_(0)
+		else:
+			kernDic = font.kerningDict()
+		for m in font.masters:
+			masterKern = kernDic.get(m.id)
+			if m.id in self.indexes and not self.verified:
+				cached = self.copies[m.id]
+				if (masterKern is None) != (cached is None) or (masterKern is not None and not masterKern.isEqualToDictionary_(cached)):
+					del self.indexes[m.id]
+			if m.id not in self.indexes:
+				self.indexes[m.id] = KerningIndex(masterKerningPairs(kernDic, m.id))
+				self.copies[m.id] = NSDictionary.alloc().initWithDictionary_copyItems_(masterKern, True) if masterKern is not None else None
+		self.verified = True
+		return dict((m.id, self.indexes[m.id]) for m in font.masters)
 
 
 class CopyKerningPairs(object):
@@ -36,7 +406,7 @@ class CopyKerningPairs(object):
 		spaceY = 10
 		# buttonSizeX = 60
 		windowWidth = spaceX * 3 + editX * 2 + 85
-		windowHeight = 260
+		windowHeight = 290
 		self.w = vanilla.FloatingWindow(
 			(windowWidth, windowHeight),  # default window size
 			"Copy Kerning Pairs Extended",  # window title
@@ -44,25 +414,29 @@ class CopyKerningPairs(object):
 		)
 
 		# UI elements:
-		self.w.tabs = vanilla.Tabs((10, 10, -10, -20 - 30), ["Pair", "Preset"])
+		self.w.tabs = vanilla.Tabs((10, 10, -10, -20 - 30), ["Pair", "Preset", "Batch"])
 		tab1 = self.w.tabs[0]
 		tab1.text0 = vanilla.TextBox((spaceX, 0, 260, textY), "Copy the kerning pair between...", sizeStyle='regular')
-		tab1.editL0 = vanilla.EditText((spaceX, spaceY + textY, editX, editY), "", sizeStyle='regular', callback=self.checkField)
-		tab1.editR0 = vanilla.EditText((spaceX * 3 + editX + 20, spaceY + textY, editX, editY), "", sizeStyle='regular', callback=self.checkField)
+		tab1.editL0 = vanilla.ComboBox((spaceX, spaceY + textY, editX, editY), [], completes=True, continuous=True, sizeStyle='regular', callback=self.checkField)
+		tab1.editR0 = vanilla.ComboBox((spaceX * 3 + editX + 20, spaceY + textY, editX, editY), [], completes=True, continuous=True, sizeStyle='regular', callback=self.checkField)
 		tab1.checkL0 = vanilla.TextBox((spaceX + editX + 5, spaceY + textY + 2, 40, textY), u"Any", sizeStyle='regular')
 		tab1.checkR0 = vanilla.TextBox((spaceX * 3 + editX * 2 + 25, spaceY + textY + 2, 40, textY), u"Any", sizeStyle='regular')
 		tab1.text1 = vanilla.TextBox((spaceX, spaceY * 2 + textY + editY, 200, textY), "...to this pair", sizeStyle='regular')
-		tab1.editL1 = vanilla.EditText((spaceX, spaceY * 3 + textY * 2 + editY, editX, editY), "", sizeStyle='regular', callback=self.checkField)
-		tab1.editR1 = vanilla.EditText((spaceX * 3 + editX + 20, spaceY * 3 + textY * 2 + editY, editX, editY), "", sizeStyle='regular', callback=self.checkField)
+		tab1.editL1 = vanilla.ComboBox((spaceX, spaceY * 3 + textY * 2 + editY, editX, editY), [], completes=True, continuous=True, sizeStyle='regular', callback=self.checkField)
+		tab1.editR1 = vanilla.ComboBox((spaceX * 3 + editX + 20, spaceY * 3 + textY * 2 + editY, editX, editY), [], completes=True, continuous=True, sizeStyle='regular', callback=self.checkField)
 		tab1.checkL1 = vanilla.TextBox((spaceX + editX + 5, spaceY * 3 + textY * 2 + editY + 2, 40, textY), u"Any", sizeStyle='regular')
 		tab1.checkR1 = vanilla.TextBox((spaceX * 3 + editX * 2 + 25, spaceY * 3 + textY * 2 + editY + 2, 40, textY), u"Any", sizeStyle='regular')
 		tab1.text2 = vanilla.TextBox((spaceX, spaceY * 5 + textY * 3 + editY, 400, textY * 2), "Groups will be automatically detected.\nYou can also type group name with @ prefix (e.g. @A)", sizeStyle='regular')
 
+		tab1.loadButton = vanilla.Button((spaceX, spaceY * 6 + textY * 5 + editY, 110, 20), "Load CSV...", sizeStyle='regular', callback=self.loadPairList)
+		tab1.pasteButton = vanilla.Button((spaceX + 120, spaceY * 6 + textY * 5 + editY, 110, 20), "Paste CSV", sizeStyle='regular', callback=self.loadPairList)
+		tab1.addButton = vanilla.Button((-130 - spaceX, spaceY * 6 + textY * 5 + editY, -spaceX, 20), "Add to Batch", sizeStyle='regular', callback=self.addToBatch)
+
 		tab2 = self.w.tabs[1]
 		tab2.radio = vanilla.RadioGroup((spaceX, 2, 80, 78), ["Letter", "Numeral"], isVertical=True, sizeStyle='regular', callback=self.checkRadio)
-		tab2.popLetter = vanilla.PopUpButton((spaceX + 100, spaceY, 320, 20), ["Caps to Small Caps", "Caps & Lowercase to Superscript", "Caps & Lowercase to Subscript", "Cap to Lowercase", "Punctuation to Small Caps"], sizeStyle='regular')
-		tab2.popNum1 = vanilla.PopUpButton((spaceX + 100, spaceY + 40, 140, 20), ["Lining Proportional", "Small Cap", "Numerator", "Denominator", "Superscript", "Subscript", "Default"], sizeStyle='regular')
-		tab2.popNum2 = vanilla.PopUpButton((spaceX + 100 + 180, spaceY + 40, 140, 20), ["Lining Proportional", "Small Cap", "Numerator", "Denominator", "Superscript", "Subscript", "Default"], sizeStyle='regular')
+		tab2.popLetter = vanilla.PopUpButton((spaceX + 100, spaceY, 320, 20), [preset["title"] for preset in loadPresetTables()["letterPresets"]], sizeStyle='regular')
+		tab2.popNum1 = vanilla.PopUpButton((spaceX + 100, spaceY + 40, 140, 20), [preset["title"] for preset in loadPresetTables()["numeralPresets"]], sizeStyle='regular')
+		tab2.popNum2 = vanilla.PopUpButton((spaceX + 100 + 180, spaceY + 40, 140, 20), [preset["title"] for preset in loadPresetTables()["numeralPresets"]], sizeStyle='regular')
 		tab2.textTo = vanilla.TextBox((spaceX + 100 + 151, spaceY + 40, 20, textY), "to", sizeStyle='regular')
 		tab2.textScale = vanilla.TextBox((spaceX, spaceY + 80, 100, textY), "Scale to", sizeStyle='regular')
 		tab2.textScalePercent = vanilla.TextBox((spaceX * 3 + 70, spaceY + 80, 20, textY), "%", sizeStyle='regular')
@@ -71,12 +445,39 @@ class CopyKerningPairs(object):
 		tab2.textSkipUnits = vanilla.TextBox((spaceX + 344, spaceY + 80, 40, textY), "units", sizeStyle='regular')
 		tab2.editSkip = vanilla.EditText((spaceX + 312, spaceY + 77, 30, editY), '10', sizeStyle='regular')
 		tab2.textNote = vanilla.TextBox((spaceX, spaceY * 3 + textY + 76, 360, textY * 2), "It only copies pairs between the groups.\nBut regular punctuations and symbols are taken care of.", sizeStyle='regular')
+		tab2.textMasterScale = vanilla.TextBox((spaceX, spaceY * 4 + textY * 3 + 79, 90, textY), "Per master %", sizeStyle='regular')
+		tab2.editMasterScale = vanilla.EditText((spaceX + 90, spaceY * 4 + textY * 3 + 76, 170, editY), "", placeholder="e.g. 100, 95, 90", sizeStyle='regular')
+		tab2.addButton = vanilla.Button((-130 - spaceX, spaceY * 4 + textY * 3 + 76, -spaceX, 20), "Add to Batch", sizeStyle='regular', callback=self.addToBatch)
+
+		tab3 = self.w.tabs[2]
+		tab3.list = vanilla.List(
+			(spaceX, 0, -spaceX, -30),
+			[],
+			columnDescriptions=[
+				{"title": "Preset", "key": "preset", "editable": False},
+				{"title": "Scale %", "key": "scale", "width": 60, "editable": True},
+				{"title": "Per master %", "key": "masterScale", "width": 100, "editable": True},
+				{"title": "Skip", "key": "skip", "width": 50, "editable": True},
+			],
+		)
+		tab3.removeButton = vanilla.Button((-130 - spaceX, -22, -spaceX, 20), "Remove", sizeStyle='regular', callback=self.removeFromBatch)
+		tab3.textNote = vanilla.TextBox((spaceX, -20, -150, textY), "All presets and pairs are copied in one go.", sizeStyle='regular')
 
 		# Common:
 		self.w.allMaster = vanilla.CheckBox((spaceX, -20 - 15, 100, -15), "All masters", sizeStyle='regular')
 		self.w.presetDebug = vanilla.CheckBox((spaceX + 100, -20 - 15, 150, -15), "Preset Debug Report", sizeStyle='regular')
+		self.w.dryRun = vanilla.CheckBox((spaceX + 250, -20 - 15, 80, -15), "Dry run", sizeStyle='regular')
 		self.w.runButton = vanilla.Button((-80 - 15, -20 - 15, -15, -15), "Run", sizeStyle='regular', callback=self.CopyKerningPairsMain)
 
+		# glyph and group names for validating and completing the pair fields, rebuilt when glyphs or groups change
+		self.names = KerningNameRegistry(f)
+		# kerning snapshots, shared across Run clicks until the font changes
+		self.kernCache = KerningSnapshotCache()
+		# preset name maps, compiled once per font and kept until its glyphs or groups change
+		self.presets = PresetCompiler(f)
+		Glyphs.addCallback(self.fontChanged, UPDATEINTERFACE)
+		self.w.bind("close", self.windowClosed)
+
 		# Load Settings:
 		if not self.LoadPreferences():
 			print("Note: 'Copy Kerning Pairs' could not load preferences. Will resort to defaults")
@@ -88,6 +489,14 @@ class CopyKerningPairs(object):
 		tab2.popNum2.enable(False)
 		self.w.makeKey()
 
+	def fontChanged(self, sender):
+		self.kernCache.unverify()
+		self.names.unverify()
+		self.presets.unverify()
+
+	def windowClosed(self, sender):
+		Glyphs.removeCallback(self.fontChanged)
+
 	def SavePreferences(self, sender):
 		try:
 			pass
@@ -105,32 +514,27 @@ class CopyKerningPairs(object):
 
 	def checkField(self, sender):
 		try:
-			if f.glyphs[self.w.tabs[0].editL0.get()] or self.w.tabs[0].editL0.get() in groups1:
-				self.w.tabs[0].checkL0.set("✓")
-			elif self.w.tabs[0].editL0.get() == "":
-				self.w.tabs[0].checkL0.set("Any")
-			else:
-				self.w.tabs[0].checkL0.set("?")
-				self.w.tabs[0].editL1.enable(True)
-			if f.glyphs[self.w.tabs[0].editR0.get()] or self.w.tabs[0].editR0.get() in groups2:
-				self.w.tabs[0].checkR0.set("✓")
-			elif self.w.tabs[0].editR0.get() == "":
-				self.w.tabs[0].checkR0.set("Any")
-			else:
-				self.w.tabs[0].checkR0.set("?")
-				self.w.tabs[0].editR1.enable(True)
-			if f.glyphs[self.w.tabs[0].editL1.get()] or self.w.tabs[0].editL1.get() in groups1:
-				self.w.tabs[0].checkL1.set("✓")
-			elif self.w.tabs[0].editL1.get() == "":
-				self.w.tabs[0].checkL1.set("Any")
-			else:
-				self.w.tabs[0].checkL1.set("?")
-			if f.glyphs[self.w.tabs[0].editR1.get()] or self.w.tabs[0].editR1.get() in groups2:
-				self.w.tabs[0].checkR1.set("✓")
-			elif self.w.tabs[0].editR1.get() == "":
-				self.w.tabs[0].checkR1.set("Any")
-			else:
-				self.w.tabs[0].checkR1.set("?")
+			tab1 = self.w.tabs[0]
+			fields = [
+				(tab1.editL0, tab1.checkL0, True, tab1.editL1),
+				(tab1.editR0, tab1.checkR0, False, tab1.editR1),
+				(tab1.editL1, tab1.checkL1, True, None),
+				(tab1.editR1, tab1.checkR1, False, None),
+			]
+			for edit, check, left, destination in fields:
+				name = edit.get()
+				if self.names.isValid(name, left):
+					check.set("✓")
+				elif name == "":
+					check.set("Any")
+				else:
+					check.set("?")
+					if destination is not None:
+						destination.enable(True)
+			if sender is not None:
+				for edit, check, left, destination in fields:
+					if edit == sender:
+						sender.setItems(self.names.completions(sender.get(), left))
 		except Exception as e:
 			Glyphs.showMacroWindow()
 			print("Copy kerning Pairs Error (checkField): %s" % e)
@@ -149,285 +553,207 @@ class CopyKerningPairs(object):
 			Glyphs.showMacroWindow()
 			print("Copy kerning Pairs Error (checkRadio): %s" % e)
 
-	def applyKern1(self, theMaster, newKernDic, L0, R0, L1, R1):
-		print(theMaster.name)
-		pairList = newKernDic[theMaster.id]
-		for i in range(len(pairList)):
-			if pairList[i][1] == R0:
-				print("\t%s,  %s,  %s" % (pairList[i][0], R1, pairList[i][2]))
-				f.setKerningForPair(theMaster.id, pairList[i][0], R1, pairList[i][2])
-
-	def applyKern2(self, theMaster, newKernDic, L0, R0, L1, R1):
-		print(theMaster.name)
-		pairList = newKernDic[theMaster.id]
-		for i in range(len(pairList)):
-			if pairList[i][0] == L0:
-				print("\t%s,  %s,  %s" % (L1, pairList[i][1], pairList[i][2]))
-				f.setKerningForPair(theMaster.id, L1, pairList[i][1], pairList[i][2])
-
-	def applyKern3(self, theMaster, newKernDic, L0, R0, L1, R1):
-		print(theMaster.name)
-		pairList = newKernDic[theMaster.id]
-		i = 0
-		value = None
-		while i != len(newKernDic[theMaster.id]):
-			if pairList[i][0] == L0 and pairList[i][1] == R0:
-				value = pairList[i][2]
-				#print "\t%s,  %s,  %s" % (pairList[i][0], pairList[i][1], pairList[i][2])
-				break
-			i = i + 1
-		if value is None:
-			print("The source pair does not exist.")
+	# The applyKern and computeKernPreset methods only read a master's KerningIndex and return the pairs to write.
+	# They never touch the font or the window, so every master is computed first and written in one batch afterwards.
+	def currentPreset(self):
+		# the preset chosen in the Preset tab, as a row of the Batch list
+		tab2 = self.w.tabs[1]
+		row = {"scale": tab2.editScale.get(), "masterScale": tab2.editMasterScale.get(), "skip": tab2.editSkip.get(), "letter": -1, "num1": -1, "num2": -1}
+		if tab2.radio.get() == 0:
+			row["letter"] = tab2.popLetter.get()
+			row["preset"] = loadPresetTables()["letterPresets"][row["letter"]]["title"]
 		else:
-			print("\t%s,  %s,  %s" % (L1, R1, pairList[i][2]))
-			f.setKerningForPair(theMaster.id, L1, R1, pairList[i][2])
-
+			row["num1"] = tab2.popNum1.get()
+			row["num2"] = tab2.popNum2.get()
+			row["preset"] = "Numeral: %s to %s" % (loadPresetTables()["numeralPresets"][row["num1"]]["title"], loadPresetTables()["numeralPresets"][row["num2"]]["title"])
+		return row
 
-	def dupliKernPair(self, newKernDic, L0, R0, L1, R1):
+	def currentPair(self):
+		# the pair typed in the Pair tab, as a row of the Batch list
+		tab1 = self.w.tabs[0]
+		return self.pairRow(tab1.editL0.get(), tab1.editR0.get(), tab1.editL1.get(), tab1.editR1.get())
+
+	def pairRow(self, L0, R0, L1, R1):
+		return {"preset": "Pair: %s %s to %s %s" % (L0 or "Any", R0 or "Any", L1 or "Any", R1 or "Any"), "pair": [L0, R0, L1, R1], "scale": "", "masterScale": "", "skip": ""}
+
+	def normalizePair(self, L0, R0, L1, R1):
+		# returns ((L0, R0, L1, R1), None) with empty destinations filled in from the source, or (None, error message)
+		if L0 == R0 == "":
+			return None, 'You cannot leave both sides of the pair as "Any."'
+		if (L0 == "" and L1 != "") or (R0 == "" and R1 != ""):
+			return None, '"Any" should only be allowed on either side. And if the source pair consists of "Any", the same side of the destination should also be "Any".'
+		for name, left in ((L0, True), (R0, False), (L1, True), (R1, False)):
+			if name != "" and not self.names.isValid(name, left):
+				return None, 'Please make sure the glyphs or groups exists. (%s)' % name
+		if L1 == "":
+			L1 = L0
+		if R1 == "":
+			R1 = R0
+		if L0 == L1 and R0 == R1:
+			return None, 'Source and destination are the same.'
+		return (L0, R0, L1, R1), None
+
+	def addToBatch(self, sender):
 		try:
-			print("Following pairs have been added.\n")
-			L0 = re.sub("@", "@MMK_L_", L0)
-			R0 = re.sub("@", "@MMK_R_", R0)
-			L1 = re.sub("@", "@MMK_L_", L1)
-			R1 = re.sub("@", "@MMK_R_", R1)
-			if "@" not in L0:
-				try:
-					L0 = "@MMK_L_" + f.glyphs[L0].rightKerningGroup
-				except:
-					pass
-			if "@" not in R0:
-				try:
-					R0 = "@MMK_R_" + f.glyphs[R0].leftKerningGroup
-				except:
-					pass
-			if "@" not in L1:
-				try:
-					L1 = "@MMK_L_" + f.glyphs[L1].rightKerningGroup
-				except:
-					pass
-			if "@" not in R1:
-				try:
-					R1 = "@MMK_R_" + f.glyphs[R1].leftKerningGroup
-				except:
-					pass
-			print("__self.w.allMaster.get()", self.w.allMaster.get(), type(self.w.allMaster.get()))
-			if L0 == "":
-				if self.w.allMaster.get() == True:
-					for thisMaster in f.masters:
-						self.applyKern1(thisMaster, newKernDic, L0, R0, L1, R1)
-				elif self.w.allMaster.get() == False:
-					self.applyKern1(f.selectedFontMaster, newKernDic, L0, R0, L1, R1)
-
-			elif R0 == "":
-				if self.w.allMaster.get() == True:
-					for thisMaster in f.masters:
-						self.applyKern2(thisMaster, newKernDic, L0, R0, L1, R1)
-				elif self.w.allMaster.get() == False:
-					self.applyKern2(f.selectedFontMaster, newKernDic, L0, R0, L1, R1)
-
+			if sender == self.w.tabs[0].addButton:
+				row = self.currentPair()
+				pair, problem = self.normalizePair(*row["pair"])
+				if problem:
+					Glyphs.showAlert_message_OKButton_("Invalid input", problem, 'OK')
+					return
+				self.w.tabs[2].list.append(row)
+				return
+			row = self.currentPreset()
+			if row["letter"] == -1 and row["num1"] == row["num2"]:
+				Glyphs.displayDialog_("You cannot set the same group as source and destination.")
 			else:
-				if self.w.allMaster.get() == True:
-					for thisMaster in f.masters:
-						self.applyKern3(thisMaster, newKernDic, L0, R0, L1, R1)
-
-				elif self.w.allMaster.get() == False:
-					self.applyKern3(f.selectedFontMaster, newKernDic, L0, R0, L1, R1)
-
+				self.w.tabs[2].list.append(row)
 		except Exception as e:
 			Glyphs.showMacroWindow()
-			print("Copy kerning Pairs Error (dupliKernPair): %s" % e)
+			print("Copy kerning Pairs Error (addToBatch): %s" % e)
 
-	def miscSymbolDic(self, miscType):
-		miscSymbols = [g.name for g in f.glyphs if (g.category == "Punctuation" or g.category == "Symbol")]
-		#miscSymbols = ["period", "comma", "colon", "semicolon", "minus", "plus","equal", "parenleft", "parenright", "question", "questiondown", "exclam", "exclamdown", "hyphen", "asterisk", "quoteleft", "quoteright", "backslash", "slash", "guillemetright", "guillemetleft", "registered", "trademark", "servicemark"] #Manually set list.
-		miscSymbolDicNew = {}
-		if miscType == "superscript":
-			suffix1 = ".sups"
-			suffix2 = "superior"
-		elif miscType == "subscript":
-			suffix1 = ".subs"
-			suffix2 = "inferior"
-		elif miscType == "smallcap":
-			suffix1 = ".sc"
-			suffix2 = ".c2sc"
-			suffix3 = ".smcp"
-		for thisSymbol in miscSymbols:
-			if f.glyphs[thisSymbol + suffix1]:
-				miscSymbolDicNew.update({thisSymbol: thisSymbol + suffix1})
-			elif f.glyphs[thisSymbol + suffix2]:
-				miscSymbolDicNew.update({thisSymbol: thisSymbol + suffix2})
-			elif miscType == "smallcap" and f.glyphs[thisSymbol + suffix3]:
-				miscSymbolDicNew.update({thisSymbol: thisSymbol + suffix3})
-		return miscSymbolDicNew
-
-
-
-	def numList(self, Suf):
-		nums = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
-		if Suf == 0:  # Lining Proportional (.lf)
-			for i in range(len(nums)):
-				nums[i] = nums[i] + ".lf"
-		elif Suf == 1:  # Small Cap (.sc or .smcp)
-			for i in range(len(nums)):
-				if f.glyphs[nums[i] + ".sc"]:
-					nums[i] = nums[i] + ".sc"
-				elif f.glyphs[nums[i] + ".c2sc"]:
-					nums[i] = nums[i] + ".c2sc"
-				elif f.glyphs[nums[i] + ".smcp"]:
-					nums[i] = nums[i] + ".smcp"
-		elif Suf == 2:  # Numerator (.numr)
-			for i in range(len(nums)):
-				nums[i] = nums[i] + ".numr"
-		elif Suf == 3:  # Denominator (.dnom)
-			for i in range(len(nums)):
-				nums[i] = nums[i] + ".dnom"
-		elif Suf == 4:  # Superscript (.sups or superior)
-			for i in range(len(nums)):
-				if f.glyphs[nums[i] + ".sups"]:
-					nums[i] = nums[i] + ".sups"
-				elif f.glyphs[nums[i] + "superior"]:
-					nums[i] = nums[i] + "superior"
-		elif Suf == 5:  # Subscript (.subs or inferior)
-			for i in range(len(nums)):
-				if f.glyphs[nums[i] + ".subs"]:
-					nums[i] = nums[i] + ".subs"
-				elif f.glyphs[nums[i] + "inferior"]:
-					nums[i] = nums[i] + "inferior"
-		elif Suf == 6:  # Default
-			for i in range(len(nums)):
-				nums[i] = nums[i]
-		return nums
-
-	def applyKernPreset(self, theMaster, newKernDic, dicL, dicR, scale, skip):
+	def loadPairList(self, sender):
+		# Adds pair mappings from CSV text to the Batch list. One mapping per line: L0, R0, L1, R1.
+		# An empty field means Any (on the source) or the same as the source (on the destination). Lines starting with # are ignored.
 		try:
-			print(theMaster.name)
-			pairList = newKernDic[theMaster.id]
-
-			if self.w.presetDebug.get() == True:
-				print("These are all the kerning pairs in the Master", pairList)
-
-			for keyL in dicL:
-				for keyR in dicR:
-					if self.w.presetDebug.get() == True:
-						print("This is the pair combination that I am looking for in existing kerning:", keyL, keyR)
-					for i in range(len(pairList)):
-						if pairList[i][0] == keyL and pairList[i][1] == keyR:
-							if self.w.presetDebug.get() == True:
-								print("Found", keyL, "and", keyR, "to apply to", dicL[keyL], dicR[keyR])
-							if int(abs(float(pairList[i][2]) * scale)) >= int(skip):
-								theValue = int(round(float(pairList[i][2]) * scale))
-								print("\t%s,  %s,  %s" % (dicL[keyL], dicR[keyR], theValue))
-								f.setKerningForPair(theMaster.id, dicL[keyL], dicR[keyR], theValue)
-								#return "\t%s,  %s,  %s" % (dicL[keyL], dicR[keyR], theValue)
+			if sender == self.w.tabs[0].pasteButton:
+				text = NSPasteboard.generalPasteboard().stringForType_(NSPasteboardTypeString) or ""
+			else:
+				paths = getFile(fileTypes=["csv", "txt"])
+				if not paths:
+					return
+				with codecs.open(paths[0], "r", "utf-8") as csvFile:
+					text = csvFile.read()
+			rows = []
+			problems = []
+			for lineNumber, fields in enumerate(csv.reader(text.splitlines()), 1):
+				fields = [field.strip() for field in fields]
+				if not fields or not "".join(fields) or fields[0].startswith("#"):
+					continue
+				fields = (fields + ["", "", "", ""])[:4]
+				pair, problem = self.normalizePair(*fields)
+				if problem:
+					problems.append("\tline %s (%s): %s" % (lineNumber, ", ".join(fields), problem))
+				else:
+					rows.append(self.pairRow(*fields))
+			self.w.tabs[2].list.extend(rows)
+			print("Copy Kerning Pairs: %s pair mappings added to the Batch tab." % len(rows))
+			if problems:
+				Glyphs.showMacroWindow()
+				print("These lines were skipped:\n%s" % "\n".join(problems))
 		except Exception as e:
 			Glyphs.showMacroWindow()
-			print("Copy kerning Pairs Error (applyKernPreset): %s" % e)
+			print("Copy kerning Pairs Error (loadPairList): %s" % e)
 
+	def removeFromBatch(self, sender):
+		try:
+			for i in reversed(self.w.tabs[2].list.getSelection()):
+				del self.w.tabs[2].list[i]
+		except Exception as e:
+			Glyphs.showMacroWindow()
+			print("Copy kerning Pairs Error (removeFromBatch): %s" % e)
+
+	def dupliBatchRow(self, kernIndex, changes, row):
+		# resolves one row of the Batch list through the shared preset compiler and adds its pairs to the change set
+		if row.get("pair"):
+			pair, problem = self.normalizePair(*row["pair"])
+			if problem:
+				print("%s skipped: %s" % (row["preset"], problem))
+			else:
+				self.dupliKernPair(kernIndex, changes, *pair)
+			return
+		scales = masterScales(row["scale"], row.get("masterScale") or "", f.masters)
+		skip = int(row["skip"])
+		if int(row["letter"]) != -1:
+			preset = loadPresetTables()["letterPresets"][int(row["letter"])]
+			presetMap = self.presets.letterMap(int(row["letter"]))
+			punctuation = preset.get("punctuation", False)
+		else:
+			presetMap = self.presets.numeralMap(int(row["num1"]), int(row["num2"]))
+			punctuation = False
+		if self.w.presetDebug.get() == True:
+			print("\n This is the final dictionary with all the pairings of %s:" % row["preset"], presetMap)
+		self.dupliKernPreset(kernIndex, changes, presetMap, scales, skip, punctuation)
 
-	def dupliPunc(self, theMaster, newKernDic, dicL, dicR, scale, skip):
+	def applyKern1(self, masterIndex, L0, R0, L1, R1):
+		return [(left, R1, value) for left, value in masterIndex.pairsWithRight(R0)]
 
-		nrmlSymbols = [g.name for g in f.glyphs if (g.category == "Punctuation" or g.category == "Symbol")]
-		#nrmlSymbols = ["period", "comma", "colon", "semicolon", "minus", "plus", "equal", "parenleft", "parenright", "question", "questiondown", "exclam", "exclamdown", "hyphen", "asterisk", "quoteleft", "quoteright", "backslash", "slash", "guillemetright", "guillemetleft", "registered", "trademark", "servicemark", "quotedbl"] #Manually set list
-		nrmlSymbolL = {}
-		nrmlSymbolR = {}
+	def applyKern2(self, masterIndex, L0, R0, L1, R1):
+		return [(L1, right, value) for right, value in masterIndex.pairsWithLeft(L0)]
 
-		if self.w.presetDebug.get() == True:
-			print("\n This is the list of symbols I am checking", nrmlSymbols)
+	def applyKern3(self, masterIndex, L0, R0, L1, R1):
+		value = masterIndex.value(L0, R0)
+		if value is None:
+			return None
+		return [(L1, R1, value)]
 
+	def dupliKernPair(self, kernIndex, changes, L0, R0, L1, R1):
+		try:
+			L0 = self.presets.pairKey(L0, True)
+			R0 = self.presets.pairKey(R0, False)
+			L1 = self.presets.pairKey(L1, True)
+			R1 = self.presets.pairKey(R1, False)
+			if L0 == "":
+				applyKern = self.applyKern1
+			elif R0 == "":
+				applyKern = self.applyKern2
+			else:
+				applyKern = self.applyKern3
 
-		for thisSymbol in nrmlSymbols:
-			if f.glyphs[thisSymbol]:
-				if f.glyphs[thisSymbol].rightKerningGroup:
-					newSymbL = "@MMK_L_" + f.glyphs[thisSymbol].rightKerningGroup
-				else:
-					newSymbL = thisSymbol
-				if f.glyphs[thisSymbol].leftKerningGroup:
-					newSymbR = "@MMK_R_" + f.glyphs[thisSymbol].leftKerningGroup
-				else:
-					newSymbR = thisSymbol
+			if self.w.allMaster.get() == True:
+				masters = list(f.masters)
 			else:
-				newSymbL = None
-				newSymbR = None
+				masters = [f.selectedFontMaster]
 
+			for thisMaster in masters:
+				newPairs = applyKern(kernIndex[thisMaster.id], L0, R0, L1, R1)
+				if newPairs is None:
+					print("%s: The source pair does not exist." % thisMaster.name)
+					continue
+				for left, right, value in newPairs:
+					changes.setKerning(thisMaster.id, left, right, value)
 
-			if newSymbL != None:
-				nrmlSymbolL.update({newSymbL: newSymbL})
-			if newSymbR != None:
-				nrmlSymbolR.update({newSymbR: newSymbR})
+		except Exception as e:
+			Glyphs.showMacroWindow()
+			print("Copy kerning Pairs Error (dupliKernPair): %s" % e)
 
+	def computeKernPreset(self, masterIndex, pairMaps, scale, skip, debug=False):
+		# pairMaps is a list of (dicL, dicR), each mapping source kerning keys to destination keys.
+		# returns [(left, right, value), ...] for the destination
+		destinations = []
+		sourceValues = []
+		if debug:
+			print("These are all the kerning pairs in the Master", sorted(masterIndex.items()))
+		for dicL, dicR in pairMaps:
+			for keyL, keyR, pairValue in masterIndex.pairsBetween(dicL, dicR):
+				if debug:
+					print("Found", keyL, "and", keyR, "to apply to", dicL[keyL], dicR[keyR])
+				destinations.append((dicL[keyL], dicR[keyR]))
+				sourceValues.append(pairValue)
+		newPairs = []
+		for (left, right), theValue in zip(destinations, scaleKerningValues(sourceValues, scale, skip)):
+			if theValue is not None:
+				newPairs.append((left, right, theValue))
+		return newPairs
+
+	def dupliPunc(self, dicL, dicR):
+		nrmlSymbolL, nrmlSymbolR = self.presets.symbolKeys()
 
 		if self.w.presetDebug.get() == True:
+			print("\n This is the list of symbols I am checking", self.presets.symbols)
 			print("\n This is the Symbol Left Group Dictionary", nrmlSymbolL)
 			print("\n This is the Symbol Right Group Dictionary", nrmlSymbolR)
 
+		# letters against regular punctuation on the right, and regular punctuation against letters on the left
+		return [(dicL, nrmlSymbolR), (nrmlSymbolL, dicR)]
 
+	def dupliKernPreset(self, kernIndex, changes, dic, scales, skip, punctuation=False):
 		try:
-			print(theMaster.name)
-			pairList = newKernDic[theMaster.id]
-
-			if self.w.presetDebug.get() == True:
-				print("These are all the kerning pairs in the Master", pairList)
-
-			for key1L in dicL:
-				for key1R in nrmlSymbolR:
-					if self.w.presetDebug.get() == True:
-						print("This is the pair combination that I am looking for in existing kerning:", key1L, key1R)
-					for i in range(len(pairList)):
-						if pairList[i][0] == key1L and pairList[i][1] == key1R:
-							if self.w.presetDebug.get() == True:
-								print("Found", key1L, "and", key1R, "to apply to", dicL[key1L], nrmlSymbolR[key1R])
-							if int(abs(float(pairList[i][2]) * scale)) >= int(skip):
-								theValue = int(round(float(pairList[i][2]) * scale))
-								print("\t%s,  %s,  %s" % (dicL[key1L], nrmlSymbolR[key1R], theValue))
-								f.setKerningForPair(theMaster.id, dicL[key1L], nrmlSymbolR[key1R], theValue)
-			for key2L in nrmlSymbolL:
-				for key2R in dicR:
-					if self.w.presetDebug.get() == True:
-						print("This is the pair combination that I am looking for in existing kerning:", key2L, key2R)
-					for i in range(len(pairList)):
-						if pairList[i][0] == key2L and pairList[i][1] == key2R:
-							if self.w.presetDebug.get() == True:
-								print("Found", key1L, "and", key1R, "to apply to", nrmlSymbolL[key2L], dicR[key2R])
-							if int(abs(float(pairList[i][2]) * scale)) >= int(skip):
-								theValue = int(round(float(pairList[i][2]) * scale))
-								print("\t%s,  %s,  %s" % (nrmlSymbolL[key2L], dicR[key2R], theValue))
-								f.setKerningForPair(theMaster.id, nrmlSymbolL[key2L], dicR[key2R], theValue)
-		except Exception as e:
-			Glyphs.showMacroWindow()
-			print("Copy kerning Pairs Error (applyKernPreset): %s" % e)
-
-
-	def dupliKernPreset(self, newKernDic, dic):
-		print("Following pairs have been added.\n")
-		try:
-			reportText = ''
 			dicL = {}
 			dicR = {}
 			for key, value in dic.items():
-				if f.glyphs[key]:
-					if f.glyphs[key].rightKerningGroup:
-						newKeyL = "@MMK_L_" + f.glyphs[key].rightKerningGroup
-					else:
-						newKeyL = key
-					if f.glyphs[key].leftKerningGroup:
-						newKeyR = "@MMK_R_" + f.glyphs[key].leftKerningGroup
-					else:
-						newKeyR = key
-				else:
-					newKeyL = None
-					newKeyR = None
-				if f.glyphs[value]:
-					if f.glyphs[value].rightKerningGroup:
-						newValueL = "@MMK_L_" + f.glyphs[value].rightKerningGroup
-					else:
-						newValueL = value
-					if f.glyphs[value].leftKerningGroup:
-						newValueR = "@MMK_R_" + f.glyphs[value].leftKerningGroup
-					else:
-						newValueR = value
-				else:
-					newValueL = None
-					newValueR = None
+				newKeyL, newKeyR = self.presets.keysFor(key)
+				newValueL, newValueR = self.presets.keysFor(value)
 				if newKeyL != None and newValueL != None:
 					if newKeyL != newValueL:  # This skips the pair if the sc group name is the same as the UC group name (i.e. A for both A and Alphaprosgegrammeni.sc)
 						dicL.update({newKeyL: newValueL})
@@ -436,12 +762,6 @@ class CopyKerningPairs(object):
 					if newKeyR != newValueR:  # This skips the pair if the sc group name is the same as the UC group name (i.e. H for both H and Dz.sc)
 						dicR.update({newKeyR: newValueR})
 
-				#if newKeyL != None and newValueL != None:
-                #    if newKeyL != newValueL:
-				#	dicL.update({newKeyL:newValueL})
-				#if newKeyR != None and newValueR != None:
-				#	dicR.update({newKeyR:newValueR})
-
 				if self.w.presetDebug.get() == True:
 					print("Original:", key, "with groups", newKeyR, newKeyL, "--> Match:", value, "with groups", newValueR, newValueL)
 
@@ -449,24 +769,20 @@ class CopyKerningPairs(object):
 				print("\n This is the Left Group Dictionary", dicL)
 				print("\n This is the Right Group Dictionary", dicR)
 
-			scale = float(self.w.tabs[1].editScale.get()) / 100
-			skip = self.w.tabs[1].editSkip.get()
+			if punctuation:
+				pairMaps = self.dupliPunc(dicL, dicR)
+			else:
+				pairMaps = [(dicL, dicR)]
 
 			if self.w.allMaster.get() == True:
-				if self.w.tabs[1].popLetter.get() != 4:
-					for thisMaster in f.masters:
-						newLine = self.applyKernPreset(thisMaster, newKernDic, dicL, dicR, scale, skip)
-				else:
-					for thisMaster in f.masters:
-						newLine = self.dupliPunc(thisMaster, newKernDic, dicL, dicR, scale, skip)
-
-			elif self.w.allMaster.get() == False:
-				if self.w.tabs[1].popLetter.get() != 4:
-					newLine = self.applyKernPreset(f.selectedFontMaster, newKernDic, dicL, dicR, scale, skip)
-				else:
-					newLine = self.dupliPunc(f.selectedFontMaster, newKernDic, dicL, dicR, scale, skip)
+				masters = list(f.masters)
+			else:
+				masters = [f.selectedFontMaster]
 
-			reportText += '\n%s' % newLine
+			debug = self.w.presetDebug.get() == True
+			for thisMaster in masters:
+				for left, right, value in self.computeKernPreset(kernIndex[thisMaster.id], pairMaps, scales[thisMaster.id], skip, debug):
+					changes.setKerning(thisMaster.id, left, right, value)
 
 		except Exception as e:
 			Glyphs.showMacroWindow()
@@ -476,287 +792,38 @@ class CopyKerningPairs(object):
 		try:
 			fMaster = f.selectedFontMaster
 
-			if Glyphs.versionNumber >= 3.0:
-				kernDic = f.kerningDictForDirection_(0)
-			else:
-				kernDic = f.kerningDict()
-			newKernDic = {}
-			for thisMaster in f.masters:
-				kernList = []
-				masterKern = kernDic[thisMaster.id]
-				for key1 in masterKern.allKeys():  # Building new kerning dictionary
-					leftKernDict = masterKern[key1]
-					for key2 in leftKernDict.allKeys():
-						pairInList = [key1, key2, leftKernDict[key2]]
-						kernList.append(pairInList)
-				newKernDic.update({thisMaster.id: kernList})
+			kernIndex = self.kernCache.kernIndex(f)
+			changes = KerningChangeSet(f, dict((mID, index.rights) for mID, index in kernIndex.items()))
 
 			if self.w.tabs.get() == 0:  # If it's an pair operation
-				editList = [self.w.tabs[0].editL0.get(), self.w.tabs[0].editR0.get(), self.w.tabs[0].editL1.get(), self.w.tabs[0].editR1.get()]
-				checkList = [self.w.tabs[0].checkL0.get(), self.w.tabs[0].checkR0.get(), self.w.tabs[0].checkL1.get(), self.w.tabs[0].checkR1.get()]
-				if editList[0] == editList[1] == "":
-					Glyphs.showAlert_message_OKButton_("Invalid input", 'You cannot leave both sides of the pair as "Any."', 'OK')
-				elif (editList[0] == "" and editList[2] != "") or (editList[1] == "" and editList[3] != ""):
-					Glyphs.showAlert_message_OKButton_("Invalid input", '"Any" should only be allowed on either side. And if the source pair consists of "Any", the same side of the destination should also be "Any".', 'OK')
-				elif "?" in checkList:
-					Glyphs.showAlert_message_OKButton_("Invalid input", 'Please make sure the glyphs or groups exists. (Eliminate ?)', 'OK')
-				# When there's no problem in the font
+				row = self.currentPair()
+				pair, problem = self.normalizePair(*row["pair"])
+				if problem:
+					Glyphs.showAlert_message_OKButton_("Invalid input", problem, 'OK')
 				else:
-					if (editList[0] != "" and editList[2] == "") and (editList[1] != "" and editList[3] != ""):
-						editList[2] = editList[0]
-						print(editList[0], editList[1], editList[2], editList[3])
-						self.dupliKernPair(newKernDic, editList[0], editList[1], editList[2], editList[3])
-					elif (editList[1] != "" and editList[3] == "") and (editList[0] != "" and editList[0] != ""):
-						editList[3] = editList[1]
-						print(editList[0], editList[1], editList[2], editList[3])
-						self.dupliKernPair(newKernDic, editList[0], editList[1], editList[2], editList[3])
-					if editList[0] == editList[2] == "" or editList[1] == editList[3] == "":
-						if editList[1] == editList[3] != "" or editList[0] == editList[2] != "":
-							Glyphs.showAlert_message_OKButton_("Invalid input", 'Source and destination are the same.', 'OK')
-						else:
-							self.dupliKernPair(newKernDic, editList[0], editList[1], editList[2], editList[3])
-					else:
-						if editList[0] == editList[2] and editList[1] == editList[3]:
-							Glyphs.showAlert_message_OKButton_("Invalid input", 'Source and destination are the same.', 'OK')
-						else:
-							self.dupliKernPair(newKernDic, editList[0], editList[1], editList[2], editList[3])
+					self.dupliKernPair(kernIndex, changes, *pair)
 
 			elif self.w.tabs.get() == 1:  # If it's an preset operation
-				if self.w.tabs[1].radio.get() == 0:  # If it's Letter preset
-					if self.w.tabs[1].popLetter.get() == 0:  # Caps to Small Caps
-						scList = [g.name for g in f.glyphs if g.category == "Letter" and (".smcp" in g.name or ".sc" in g.name or ".c2sc" in g.name)]
-						#scList = []
-						#for thisGlyph in f.glyphs:
-						#	if thisGlyph.category =="Letter" and (".c2sc" in thisGlyph.name or ".sc" in thisGlyph.name):
-						#		scList.append(thisGlyph.name)
-						capList = list(scList)
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the small caps glyphs:", capList)
-						for i in range(len(capList)):
-							capList[i] = re.sub(".smcp", "", capList[i]).capitalize()
-							capList[i] = re.sub(".c2sc", "", capList[i]).capitalize()
-							capList[i] = re.sub(".sc", "", capList[i]).capitalize()
-							if capList[i] == "Ae":
-								capList[i] = "AE"
-							elif capList[i] == "Aeacute":
-								capList[i] = "AEacute"
-							elif capList[i] == "Oe":
-								capList[i] = "OE"
-							elif capList[i] == "Ij":
-								capList[i] = "IJ"
-							elif capList[i] == "Dz":
-								capList[i] = "DZ"
-							elif capList[i] == "Dzcaron":
-								capList[i] = "DZcaron"
-							elif capList[i] == "Lj":
-								capList[i] = "LJ"
-							elif capList[i] == "Nj":
-								capList[i] = "NJ"
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the capitalised small caps:", capList)
-
-						c2scDicExt = {}
-						for i in range(len(capList)):
-							# print capList[i], scList[i]
-							if f.glyphs[capList[i]]:
-								c2scDicExt.update({capList[i]: scList[i]})
-								symb = self.miscSymbolDic("smallcap")
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of symbols that are both in UC and c2sc and will be added to the final dictionary:", symb)
-
-						c2scDicExt.update(symb)
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the final dictionary with all the UC - sc pairings:", c2scDicExt)
-						#c2scDic = dict(c2scDicExt.items() | symb.items()) #this should work in G3
-						#c2scDic = dict(c2scDicExt.items() + symb.items()) #this should work in G2
-
-						self.dupliKernPreset(newKernDic, c2scDicExt)
-
-# This time only
-
-					elif self.w.tabs[1].popLetter.get() == 4:  # Punct to Small Caps
-						scList = [g.name for g in f.glyphs if g.category == "Letter" and (".smcp" in g.name or ".sc" in g.name or ".c2sc" in g.name)]
-						#scList = []
-						#for thisGlyph in f.glyphs:
-						#	if thisGlyph.category =="Letter" and (".c2sc" in thisGlyph.name or ".sc" in thisGlyph.name):
-						#		scList.append(thisGlyph.name)
-						capList = list(scList)
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the small caps glyphs:", capList)
-						for i in range(len(capList)):
-							capList[i] = re.sub(".smcp", "", capList[i]).capitalize()
-							capList[i] = re.sub(".c2sc", "", capList[i]).capitalize()
-							capList[i] = re.sub(".sc", "", capList[i]).capitalize()
-							if capList[i] == "Ae":
-								capList[i] = "AE"
-							elif capList[i] == "Aeacute":
-								capList[i] = "AEacute"
-							elif capList[i] == "Oe":
-								capList[i] = "OE"
-							elif capList[i] == "Ij":
-								capList[i] = "IJ"
-							elif capList[i] == "Dz":
-								capList[i] = "DZ"
-							elif capList[i] == "Dzcaron":
-								capList[i] = "DZcaron"
-							elif capList[i] == "Lj":
-								capList[i] = "LJ"
-							elif capList[i] == "Nj":
-								capList[i] = "NJ"
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the capitalised small caps:", capList)
-
-						scNums = [g.name for g in f.glyphs if g.category == "Number" and (".smcp" in g.name or ".sc" in g.name or ".c2sc" in g.name)]
-						#scNums = []
-						#for thisGlyph in f.glyphs:
-						#	if thisGlyph.category =="Number" and (".c2sc" in thisGlyph.name or ".sc" in thisGlyph.name):
-						#		scNums.append(thisGlyph.name)
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the small cap numerals:", scNums)
-
-						capNums = list(scNums)
-						for i in range(len(capNums)):
-							capNums[i] = re.sub(".smcp", "", capNums[i])
-							capNums[i] = re.sub(".c2sc", "", capNums[i])
-							capNums[i] = re.sub(".sc", "", capNums[i])
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the regular numerals:", capNums)
-
-						scList += scNums
-						capList += capNums
-
-						Pc2scDicExt = {}
-						for i in range(len(capList)):
-							# print capList[i], scList[i]
-							if f.glyphs[capList[i]]:
-								Pc2scDicExt.update({capList[i]: scList[i]})
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the final dictionary with all the UC - sc pairings:", Pc2scDicExt)
-
-						self.dupliKernPreset(newKernDic, Pc2scDicExt)
-
-# This time only
-
-					elif self.w.tabs[1].popLetter.get() == 3:  # Caps to Lowercase
-						lcList = [g.name for g in f.glyphs if g.category == "Letter" and g.case == GSLowercase]
-						# lcList = []
-						#for thisGlyph in f.glyphs:
-						#		if thisGlyph.category =="Letter" and thisGlyph.subCategory == "Lowercase" :
-						#			lcList.append(thisGlyph.name)
-						capList = list(lcList)
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the lowercase glyphs:", capList)
-
-						for i in range(len(capList)):
-							capList[i] = capList[i].capitalize()
-							if capList[i] == "Ae":
-								capList[i] = "AE"
-							if capList[i] == "Aeacute":
-								capList[i] = "AEacute"
-							elif capList[i] == "Oe":
-								capList[i] = "OE"
-							elif capList[i] == "Ij":
-								capList[i] = "IJ"
-							elif capList[i] == "Dz":
-								capList[i] = "DZ"
-							elif capList[i] == "Dzcaron":
-								capList[i] = "DZcaron"
-							elif capList[i] == "Lj":
-								capList[i] = "LJ"
-							elif capList[i] == "Nj":
-								capList[i] = "NJ"
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the capitalised lowercase:", capList)
-
-						caseDic = {}
-						for i in range(len(capList)):
-							# print capList[i], lcList[i]
-							if f.glyphs[capList[i]]:
-								caseDic.update({capList[i]: lcList[i]})
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the final dictionary with all the UC - lc pairings:", caseDic)
-
-						self.dupliKernPreset(newKernDic, caseDic)
-
-# This Time Only
-
-					else:
-						if self.w.tabs[1].popLetter.get() == 1:  # Caps & Lowercase to Superscript
-							suffix = ".sups"
-							miscType = "superscript"
-						elif self.w.tabs[1].popLetter.get() == 2:  # Caps & Lowercase to Subscript
-							suffix = ".subs"
-							miscType = "subscript"
-						destiList = []
-						for g in f.glyphs:
-							if g.category == "Letter" and suffix in g.name:
-								destiList.append(g.name)
-						sourceList = list(destiList)
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the", miscType, "glyphs:", sourceList)
-
-						for i in range(len(sourceList)):
-							sourceList[i] = re.sub(suffix, "", sourceList[i])
-						if self.w.presetDebug.get() == True:
-							print("\n This is the list of all the normal matching glyphs:", sourceList)
-
-						letterDic = {}
-						for i in range(len(sourceList)):
-							if f.glyphs[sourceList[i]]:
-								letterDic.update({sourceList[i]: destiList[i]})
-						miscTypestuff = self.miscSymbolDic(miscType).items()
-						smallLetterDic = letterDic.copy()
-						smallLetterDic.update(miscTypestuff)
-
-						if self.w.presetDebug.get() == True:
-							print("\n This is the final dictionary with all the letter -", miscType, "pairings:", smallLetterDic)
-
-						#smallLetterDic = (letterDic.items() + self.miscSymbolDic(miscType).items())
-
-						self.dupliKernPreset(newKernDic, smallLetterDic)
-
-				else:  # If it's an Number preset
-					if self.w.tabs[1].popNum1.get() == self.w.tabs[1].popNum2.get():
-						Glyphs.displayDialog_("You cannot set the same group as source and destination.")
-					else:
-						numDic = {}
-						miscDic = {}
-						numList1 = self.numList(self.w.tabs[1].popNum1.get())
-						numList2 = self.numList(self.w.tabs[1].popNum2.get())
-						for i in range(len(numList1)):
-							numDic.update({numList1[i]: numList2[i]})
-						popNums = [self.w.tabs[1].popNum1.get(), self.w.tabs[1].popNum2.get()]
-						if not (2 in popNums or 3 in popNums):
-							if self.w.tabs[1].popNum1.get() == 1:
-								miscDic = self.miscSymbolDic("smallcap")
-							elif self.w.tabs[1].popNum1.get() == 4:
-								miscDic = self.miscSymbolDic("superscript")
-							elif self.w.tabs[1].popNum1.get() == 5:
-								miscDic = self.miscSymbolDic("subscript")
-							if self.w.tabs[1].popNum2.get() == 1:
-								miscDic = self.miscSymbolDic("smallcap")
-							elif self.w.tabs[1].popNum2.get() == 4:
-								miscDic = self.miscSymbolDic("superscript")
-							elif self.w.tabs[1].popNum2.get() == 5:
-								miscDic = self.miscSymbolDic("subscript")
-
-						numFinalDic = {}
-						numFinalDic.update(numDic)
-						numFinalDic.update(miscDic)
-						# unfinished. at least the dictionary is done.
-						# Careful! it hasn't done glyph validity check yet!
-						self.dupliKernPreset(newKernDic, numFinalDic)
-
-				if not self.SavePreferences(self):
-					print("Note: 'Copy Kerning Pairs' could not write preferences.")
+				row = self.currentPreset()
+				if row["letter"] == -1 and row["num1"] == row["num2"]:
+					Glyphs.displayDialog_("You cannot set the same group as source and destination.")
+				else:
+					self.dupliBatchRow(kernIndex, changes, row)
+
+			elif self.w.tabs.get() == 2:  # If it's a batch of presets
+				# every preset reads the same kerning snapshot and group map, and all of them end up in one change set
+				for row in self.w.tabs[2].list.get():
+					self.dupliBatchRow(kernIndex, changes, row)
+
+			if self.w.dryRun.get() == True:
+				changes.report(dryRun=True)
+			else:
+				changes.report()
+				if changes.apply():
+					self.kernCache.unverify()
+
+			if not self.SavePreferences(self):
+				print("Note: 'Copy Kerning Pairs' could not write preferences.")
 
 		except Exception as e:
 			# brings macro window to front and reports error:
@@ -8,6 +8,12 @@ __doc__ = """
 import vanilla
 from GlyphsApp import Glyphs
 import traceback
+import os
+import sys
+scriptFolder = os.path.dirname(os.path.abspath(__file__))  # kerningChanges.py is next to this script
+if scriptFolder not in sys.path:
+	sys.path.append(scriptFolder)
+from kerningChanges import KerningChangeSet
 
 #Stores a Latin glyph name as key and G/C glyph as unicode value, because glyph name may differ
 Grk = {"A": "0391", "B": "0392", "E": "0395", "H": "0397", "I": "0399", "K": "039A", "M": "039C", "N": "039D", "O": "039F", "P": "03A1", "T": "03A4", "X": "03A7", "Y": "03A5", "Z": "0396", "o": "03BF"}
@@ -79,7 +85,7 @@ class CopyKerningToGreekCyrillic(object):
 			return f.glyphForId_(keyName).name
 
 	# duplication of Latin letter-to-letter pairs to the given dictionary
-	def dupliKern(self, f, kernDic, nonLetterGroupsL, nonLetterGroupsR, dic):
+	def dupliKern(self, f, kernDic, changes, nonLetterGroupsL, nonLetterGroupsR, dic):
 		try:
 			# add small cap to the kernKeysDic if it exists:
 			if f.glyphs["a.sc"] or f.glyphs["a.smcp"]:
@@ -172,7 +178,7 @@ class CopyKerningToGreekCyrillic(object):
 									try:
 										# this print function conflicts with glyph name/key
 										print("  %s   %s   %s   %s" % (m.name, leftOfPair, rightOfPair, value))
-										f.setKerningForPair(m.id, leftOfPair, rightOfPair, value)
+										changes.setKerning(m.id, leftOfPair, rightOfPair, value)
 									except:
 										print('dupliKern error: ', traceback.format_exc())
 
@@ -184,6 +190,7 @@ class CopyKerningToGreekCyrillic(object):
 		try:
 			f = Glyphs.font
 			kernDic = f.kerning
+			changes = KerningChangeSet(f, kernDic)
 			f.disableUpdateInterface()
 			Glyphs.clearLog()
 			print("Following pairs have been added or updated.\n")
@@ -205,7 +212,7 @@ class CopyKerningToGreekCyrillic(object):
 					Grk[key1] = f.glyphForUnicode_(value1).name
 				except:
 					pass
-			self.dupliKern(f, kernDic, nonLetterGroupsL, nonLetterGroupsR, Grk)
+			self.dupliKern(f, kernDic, changes, nonLetterGroupsL, nonLetterGroupsR, Grk)
 
 			print("Cyrillic")
 			if self.w.AllCapBox.get():  # if all-caps
@@ -221,7 +228,8 @@ class CopyKerningToGreekCyrillic(object):
 					CyrDic[key2] = f.glyphForUnicode_(value2).name
 				except:
 					pass
-			self.dupliKern(f, kernDic, nonLetterGroupsL, nonLetterGroupsR, CyrDic)
+			self.dupliKern(f, kernDic, changes, nonLetterGroupsL, nonLetterGroupsR, CyrDic)
+			changes.apply()
 
 			f.enableUpdateInterface()
 			Glyphs.showMacroWindow()
@@ -7,6 +7,33 @@ __doc__ = """
 
 import vanilla
 from GlyphsApp import Glyphs
+import os
+import sys
+scriptFolder = os.path.dirname(os.path.abspath(__file__))  # kerningChanges.py is next to this script
+if scriptFolder not in sys.path:
+	sys.path.append(scriptFolder)
+from kerningChanges import KerningChangeSet
+
+
+def tabPairs(tab):
+	# adjacent (left layer, right layer) pairs of the selected range of the tab, or of the whole tab if nothing is selected.
+	# line breaks and other placeholders end a run.
+	layers = list(tab.layers)
+	if tab.textRange > 0:
+		start = getattr(tab, "layersCursor", tab.textCursor)
+		layers = layers[start:start + tab.textRange]
+	pairs = []
+	for prevLayer, activeLayer in zip(layers, layers[1:]):
+		if validLayer(prevLayer) and validLayer(activeLayer):
+			pairs.append((prevLayer, activeLayer))
+	return pairs
+
+
+def validLayer(layer):
+	if (layer == None) or (layer.name == None) or (layer.parent == None):
+		return False
+	else:
+		return True
 
 
 class KerningException(object):
@@ -17,7 +44,7 @@ class KerningException(object):
 		buttonSizeX = 220
 		buttonSizeY = 20
 		windowWidth = spaceX * 2 + buttonSizeX
-		windowHeight = spaceY * 5 + buttonSizeY * 4
+		windowHeight = spaceY * 6 + buttonSizeY * 5
 		self.w = vanilla.FloatingWindow(
 			(windowWidth, windowHeight),  # default window size
 			"Kerning Exception",  # window title
@@ -30,6 +57,7 @@ class KerningException(object):
 		self.w.runButton2 = vanilla.Button((spaceX, spaceY * 2 + buttonSizeY, buttonSizeX, buttonSizeY), "2 🔓 🔒 Unlock Left (aT→áT)", sizeStyle='regular', callback=self.KerningExceptionMain)
 		self.w.runButton3 = vanilla.Button((spaceX, spaceY * 3 + buttonSizeY * 2, buttonSizeX, buttonSizeY), "3 🔓 🔓 Unlock Both ", sizeStyle='regular', callback=self.KerningExceptionMain)
 		self.w.runButton4 = vanilla.Button((spaceX, spaceY * 4 + buttonSizeY * 3, buttonSizeX, buttonSizeY), "4 🔒 🔒 Lock Both ", sizeStyle='regular', callback=self.KerningExceptionMain)
+		self.w.batchCheck = vanilla.CheckBox((spaceX, spaceY * 5 + buttonSizeY * 4, buttonSizeX, buttonSizeY), "Whole tab or selection, all masters", value=False, sizeStyle='small')
 
 		# Assign keyboard shortcuts
 		self.w.runButton1.bind('1', [])
@@ -41,15 +69,57 @@ class KerningException(object):
 		self.w.open()
 		self.w.makeKey()
 
+	def batchExceptions(self, sender, f):
+		# applies the operation of sender to every adjacent pair of the tab (or selection) in every master, in one change set
+		if Glyphs.versionNumber < 3.0:
+			Glyphs.displayDialog('Batch mode needs Glyphs 3.')
+			return
+		pairs = tabPairs(f.currentTab)
+		# (right group key, left group key) per glyph, looked up once however often the glyph appears
+		groupMap = {}
+		glyphIDs = {}  # kerningDictForDirection_ keys single glyphs by ID
+		for prevLayer, activeLayer in pairs:
+			for glyph in (prevLayer.parent, activeLayer.parent):
+				if glyph.name not in groupMap:
+					glyphIDs[glyph.name] = glyph.id
+					groupMap[glyph.name] = (
+						"@MMK_L_" + glyph.rightKerningGroup if glyph.rightKerningGroup else None,
+						"@MMK_R_" + glyph.leftKerningGroup if glyph.leftKerningGroup else None,
+					)
+		changes = KerningChangeSet(f, f.kerningDictForDirection_(0), glyphIDs)  # drops exceptions already there and removals of pairs that do not exist
+		skipped = 0
+		for prevName, activeName in set((prevLayer.parent.name, activeLayer.parent.name) for prevLayer, activeLayer in pairs):
+			prevGroup = groupMap[prevName][0]
+			activeGroup = groupMap[activeName][1]
+			for m in f.masters:
+				if sender == self.w.runButton1:  # Unlock Right
+					if prevGroup is None:
+						skipped += 1
+						break
+					changes.setKerning(m.id, prevGroup, activeName, 0)
+				elif sender == self.w.runButton2:  # Unlock Left
+					if activeGroup is None:
+						skipped += 1
+						break
+					changes.setKerning(m.id, prevName, activeGroup, 0)
+				elif sender == self.w.runButton3:  # Unock Both
+					changes.setKerning(m.id, prevName, activeName, 0)
+				else:  # Lock Both
+					if prevGroup is not None:
+						changes.removeKerning(m.id, prevGroup, activeName)
+					if activeGroup is not None:
+						changes.removeKerning(m.id, prevName, activeGroup)
+					changes.removeKerning(m.id, prevName, activeName)
+		count = changes.apply()
+		print("Kerning Exception: %s pairs in %s masters, %s kerning changes, %s pairs skipped for lack of a group." % (len(pairs), len(f.masters), count, skipped))
+
 	def KerningExceptionMain(self, sender):
 		try:
-			def validLayer(layer):
-				if (layer == None) or (layer.name == None):
-					return False
-				else:
-					return True
-
 			f = Glyphs.font  # frontmost font
+			if self.w.batchCheck.get():
+				self.batchExceptions(sender, f)
+				self.w.close()  # delete if you want window to stay open
+				return
 			View = Glyphs.currentDocument.windowController().activeEditViewController().graphicView()
 			activeLayer = View.activeLayer()
 			prevLayer = View.cachedGlyphAtIndex_(View.activeIndex() - 1)
@@ -6,35 +6,304 @@ __doc__ = """
 """
 
 import vanilla
-from GlyphsApp import Glyphs
-
-thisFont = Glyphs.font
-# builing a more accessible kerning dictionary
-# it's a dictionary of lists. newKernDic[master.id][left, right, value]
-kernDic = thisFont.kerningDict()
-newKernDic = {}
-for thisMaster in thisFont.masters:
-	kernList = []
-	for key1 in kernDic[thisMaster.id]:
-		for key2 in kernDic[thisMaster.id][key1]:
-			pairInList = [key1, key2, kernDic[thisMaster.id][key1][key2]]
-			kernList.append(pairInList)
-		newKernDic[thisMaster.id] = kernList
-
-# building popup list
-# each value contains a list of glyphs involved. groupsL/R[groupName][glyph, glyph, glyph...]
-groupsL = {}
-groupsR = {}
-for thisGlyph in thisFont.glyphs:
-	if thisGlyph.leftKerningGroup != None:
-		if thisGlyph.leftKerningGroup not in groupsL:
-			groupsL[thisGlyph.leftKerningGroup] = []
-		groupsL[thisGlyph.leftKerningGroup].append(thisGlyph.name)
-
-	if thisGlyph.rightKerningGroup != None:
-		if thisGlyph.rightKerningGroup not in groupsR:
-			groupsR[thisGlyph.rightKerningGroup] = []
-		groupsR[thisGlyph.rightKerningGroup].append(thisGlyph.name)
+from vanilla.dialogs import getFile
+from GlyphsApp import Glyphs, UPDATEINTERFACE
+from AppKit import NSDictionary
+import codecs
+import csv
+import os
+import sys
+scriptFolder = os.path.dirname(os.path.abspath(__file__))  # kerningChanges.py is next to this script
+if scriptFolder not in sys.path:
+	sys.path.append(scriptFolder)
+from kerningChanges import KerningChangeSet
+
+
+class KerningKeyIndex(object):
+	# Which pairs use each kerning key, per side of the pair. pairsWith[0] is keyed by the left key, pairsWith[1] by the right key.
+	# pairsWith[side][key] = {id(pair): (masterID, pair)}, where pair is a [left, right, value] list of newKernDic.
+	# pairAt[(masterID, left, right)] = pair
+	def __init__(self, kernDic):
+		self.pairsWith = ({}, {})
+		self.pairAt = {}
+		for masterID, pairs in kernDic.items():
+			for pair in pairs:
+				self.add(masterID, pair)
+
+	def add(self, masterID, pair):
+		for side in (0, 1):
+			self.pairsWith[side].setdefault(pair[side], {})[id(pair)] = (masterID, pair)
+		self.pairAt[(masterID, pair[0], pair[1])] = pair
+
+	def remove(self, masterID, pair):
+		# call before the keys of pair are changed
+		for side in (0, 1):
+			entries = self.pairsWith[side].get(pair[side], {})
+			entries.pop(id(pair), None)
+			if not entries:
+				self.pairsWith[side].pop(pair[side], None)
+		self.pairAt.pop((masterID, pair[0], pair[1]), None)
+
+	def find(self, masterID, left, right):
+		# the [left, right, value] pair of the master, or None
+		return self.pairAt.get((masterID, left, right))
+
+	def pairsUsing(self, keys):
+		# [(masterID, pair), ...] of the pairs that use any of keys = {side: [key, ...]}, each pair once
+		found = {}
+		for side, sideKeys in keys.items():
+			for key in sideKeys:
+				found.update(self.pairsWith[side].get(key, {}))
+		return list(found.values())
+
+
+class KerningGroupCache(object):
+	# The groups and kerning of the frontmost font as this script uses them, read when the window opens.
+	# A font change notification only marks them stale. The next refresh() reads the groups again only of glyphs whose
+	# lastChange differs, and walks the pairs only of masters whose kerning is no longer equal to a copy taken at the
+	# last refresh (one native dictionary comparison per master). The script's own renames keep them up to date as
+	# they go, so the notifications those renames send are ignored.
+	def __init__(self):
+		self.font = None
+		self.stale = True
+		self.writing = False  # True while renameGroups writes to the font
+		# newKernDic[master.id] = [[left, right, value], ...]
+		self.newKernDic = {}
+		# groupsL/R[groupName] = [glyphName, glyphName, ...], glyphGroups[glyphName] = (leftGroup, rightGroup)
+		self.groupsL = {}
+		self.groupsR = {}
+		self.glyphGroups = {}
+		self.glyphChanges = {}  # glyphChanges[glyphName] = lastChange when its groups were read
+		self.kernIndex = KerningKeyIndex({})
+		self.kernCopies = {}  # kernCopies[master.id] = copy of the master's kerning dictionary newKernDic matches
+
+	def invalidate(self, sender=None):
+		if not self.writing:
+			self.stale = True
+
+	def refresh(self):
+		font = Glyphs.font
+		if font is not self.font:  # another font: start over
+			self.__init__()
+			self.font = font
+		elif not self.stale:
+			return
+		self.stale = False
+		self.refreshGroups()
+		self.refreshKerning()
+
+	def moveGlyph(self, glyphName, oldGroups, newGroups):
+		for groups, oldGroup, newGroup in ((self.groupsL, oldGroups[0], newGroups[0]), (self.groupsR, oldGroups[1], newGroups[1])):
+			if oldGroup == newGroup:
+				continue
+			if oldGroup in groups and glyphName in groups[oldGroup]:
+				groups[oldGroup].remove(glyphName)
+				if not groups[oldGroup]:
+					del groups[oldGroup]
+			if newGroup != None:
+				groups.setdefault(newGroup, []).append(glyphName)
+
+	def setGlyphGroup(self, glyphName, left, newGroup):
+		# records a group change the script has made itself
+		oldGroups = self.glyphGroups.get(glyphName, (None, None))
+		self.glyphGroups[glyphName] = (newGroup, oldGroups[1]) if left else (oldGroups[0], newGroup)
+
+	def refreshGroups(self):
+		seen = set()
+		for thisGlyph in self.font.glyphs:
+			seen.add(thisGlyph.name)
+			lastChange = thisGlyph.lastChange
+			if lastChange is not None and self.glyphChanges.get(thisGlyph.name) == lastChange:
+				continue
+			self.glyphChanges[thisGlyph.name] = lastChange
+			newGroups = (thisGlyph.leftKerningGroup, thisGlyph.rightKerningGroup)
+			oldGroups = self.glyphGroups.get(thisGlyph.name, (None, None))
+			if newGroups != oldGroups:
+				self.moveGlyph(thisGlyph.name, oldGroups, newGroups)
+				self.glyphGroups[thisGlyph.name] = newGroups
+		for glyphName in [glyphName for glyphName in self.glyphGroups if glyphName not in seen]:  # deleted glyphs
+			self.moveGlyph(glyphName, self.glyphGroups.pop(glyphName), (None, None))
+		for glyphName in [glyphName for glyphName in self.glyphChanges if glyphName not in seen]:
+			del self.glyphChanges[glyphName]
+
+	def kerningChanged(self, masterID, masterKerning):
+		if masterID not in self.kernCopies:
+			return True
+		copied = self.kernCopies[masterID]
+		if masterKerning is None or copied is None:
+			return (masterKerning is None) != (copied is None)
+		return not masterKerning.isEqualToDictionary_(copied)
+
+	def copyKerning(self, masterID, masterKerning):
+		self.kernCopies[masterID] = NSDictionary.alloc().initWithDictionary_copyItems_(masterKerning, True) if masterKerning is not None else None
+
+	def recordKerning(self, masterIDs):
+		# takes new copies after the script's own kerning changes, which are already in newKernDic
+		kernDic = self.font.kerningDict()
+		for masterID in masterIDs:
+			self.copyKerning(masterID, kernDic[masterID] if masterID in kernDic else None)
+
+	def refreshKerning(self):
+		kernDic = self.font.kerningDict()
+		masterIDs = [thisMaster.id for thisMaster in self.font.masters]
+		for masterID in masterIDs:
+			pairs = self.newKernDic.setdefault(masterID, [])
+			masterKerning = kernDic[masterID] if masterID in kernDic else None
+			if not self.kerningChanged(masterID, masterKerning):
+				continue
+			self.copyKerning(masterID, masterKerning)
+			masterKerning = masterKerning or {}
+			seen = set()
+			for key1 in masterKerning:
+				for key2 in masterKerning[key1]:
+					value = masterKerning[key1][key2]
+					seen.add((key1, key2))
+					pair = self.kernIndex.find(masterID, key1, key2)
+					if pair is None:
+						pair = [key1, key2, value]
+						pairs.append(pair)
+						self.kernIndex.add(masterID, pair)
+					elif pair[2] != value:
+						pair[2] = value
+			gone = set(id(pair) for pair in pairs if (pair[0], pair[1]) not in seen)
+			if gone:
+				for pair in pairs:
+					if id(pair) in gone:
+						self.kernIndex.remove(masterID, pair)
+				self.newKernDic[masterID] = [pair for pair in pairs if id(pair) not in gone]
+		for masterID in [masterID for masterID in self.newKernDic if masterID not in masterIDs]:  # deleted masters
+			for pair in self.newKernDic.pop(masterID):
+				self.kernIndex.remove(masterID, pair)
+			self.kernCopies.pop(masterID, None)
+
+
+# what happens when a renamed group's pair meets a pair that already has the new name, by index in the Merge popup
+MERGE_POLICIES = ["Keep source", "Keep target", "Average", "Larger absolute"]
+
+
+def mergeValues(sourceValues, targetValue, policy):
+	if policy == 1 and targetValue is not None:  # keep target
+		return targetValue
+	values = sourceValues + ([targetValue] if targetValue is not None else [])
+	if policy == 2:  # average
+		return int(round(sum(values) / len(values)))
+	if policy == 3:  # larger absolute
+		return max(values, key=abs)
+	return sourceValues[0]  # keep source
+
+
+def renameGroups(cache, renamesL, renamesR, policy=0, exceptions=False):
+	# Renames left groups by renamesL and right groups by renamesR ({oldName: newName}), together with all their pairs.
+	# The pairs are found in kernIndex by exact key, so a group whose name starts with another group's name is left alone.
+	# Left groups are on the right side of pairs (@MMK_R_), right groups on the left side (@MMK_L_).
+	# Renaming into an existing group merges the two: colliding pairs get one value by policy (see MERGE_POLICIES).
+	# With exceptions, member glyphs whose kerning would change by the merge keep their old value as an exception.
+	# Returns (pairs moved, pairs merged, exceptions added).
+	thisFont, groupsL, groupsR, newKernDic, kernIndex = cache.font, cache.groupsL, cache.groupsR, cache.newKernDic, cache.kernIndex
+	keyRenames = (
+		dict(("@MMK_L_" + old, "@MMK_L_" + new) for old, new in renamesR.items()),
+		dict(("@MMK_R_" + old, "@MMK_R_" + new) for old, new in renamesL.items()),
+	)
+	# members of every key before the rename, per pair side
+	oldMembers = (
+		dict(("@MMK_L_" + name, list(glyphNames)) for name, glyphNames in groupsR.items()),
+		dict(("@MMK_R_" + name, list(glyphNames)) for name, glyphNames in groupsL.items()),
+	)
+	# {new key: [old keys]} per pair side
+	renamedInto = ({}, {})
+	for side in (0, 1):
+		for old, new in keyRenames[side].items():
+			renamedInto[side].setdefault(new, []).append(old)
+	# existing groups that others are merged into, per pair side
+	mergeTargets = tuple(
+		set(new for new in keyRenames[side].values() if new in oldMembers[side] and new not in keyRenames[side])
+		for side in (0, 1)
+	)
+	affected = kernIndex.pairsUsing({0: list(keyRenames[0]), 1: list(keyRenames[1])})
+	affectedIDs = set(id(pair) for masterID, pair in affected)
+	# pairs landing on the same new keys are merged
+	buckets = {}
+	for masterID, pair in affected:
+		newKeys = (masterID, keyRenames[0].get(pair[0], pair[0]), keyRenames[1].get(pair[1], pair[1]))
+		buckets.setdefault(newKeys, []).append(pair)
+
+	newExceptions = []
+
+	def keepMembers(side, key, otherKey, masterID, value):
+		# exceptions for the members of key (on side of the pair) against otherKey, at their old value
+		for glyphName in oldMembers[side].get(key, []):
+			newExceptions.append((masterID, (glyphName, otherKey) if side == 0 else (otherKey, glyphName), value))
+
+	merged = 0
+	added = 0
+	dropped = set()
+	changes = KerningChangeSet(thisFont)
+	cache.writing = True
+	thisFont.disableUpdateInterface()
+	try:
+		for groups, renames, left in ((groupsL, renamesL, True), (groupsR, renamesR, False)):
+			members = dict((old, groups.pop(old)) for old in renames if old in groups)  # popped first, so names can be swapped
+			for old, glyphNames in members.items():
+				for thisGlyphName in glyphNames:
+					if left:
+						thisFont.glyphs[thisGlyphName].leftKerningGroup = renames[old]
+					else:
+						thisFont.glyphs[thisGlyphName].rightKerningGroup = renames[old]
+					cache.setGlyphGroup(thisGlyphName, left, renames[old])
+				groups.setdefault(renames[old], []).extend(glyphNames)
+		# all old pairs are queued for removal before the new ones are set, so a renamed pair replaces the removal of its key
+		for masterID, pair in affected:
+			changes.removeKerning(masterID, pair[0], pair[1])
+			kernIndex.remove(masterID, pair)
+		for (masterID, newL, newR), pairs in buckets.items():
+			target = kernIndex.find(masterID, newL, newR)
+			value = pairs[0][2]
+			if target is not None or len(pairs) > 1:
+				value = mergeValues([pair[2] for pair in pairs], target[2] if target else None, policy)
+				merged += 1
+			if exceptions:
+				newKeys = (newL, newR)
+				for side in (0, 1):
+					# every group renamed into this key, with its old value here (0 if it had no pair)
+					oldValues = dict((pair[side], pair[2]) for pair in pairs if pair[side] != newKeys[side])
+					for old in renamedInto[side].get(newKeys[side], []):
+						if oldValues.get(old, 0) != value:
+							keepMembers(side, old, newKeys[1 - side], masterID, oldValues.get(old, 0))
+					if newKeys[side] in mergeTargets[side] and (target[2] if target else 0) != value:
+						keepMembers(side, newKeys[side], newKeys[1 - side], masterID, target[2] if target else 0)
+			if target is None:
+				target = pairs[0]
+				pairs = pairs[1:]
+				target[0], target[1] = newL, newR
+				kernIndex.add(masterID, target)
+			target[2] = value
+			dropped.update(id(pair) for pair in pairs)
+			changes.setKerning(masterID, newL, newR, value)
+		if exceptions:
+			# target pairs without a source pair: the merged-in members had no kerning there
+			for side in (0, 1):
+				for new in mergeTargets[side]:
+					for masterID, pair in list(kernIndex.pairsWith[side].get(new, {}).values()):
+						if id(pair) in affectedIDs or pair[2] == 0 or (masterID, pair[0], pair[1]) in buckets:
+							continue
+						for old in renamedInto[side][new]:
+							keepMembers(side, old, pair[1 - side], masterID, 0)
+		for masterID, (left, right), value in newExceptions:
+			if kernIndex.find(masterID, left, right) is None:  # an exception already there wins
+				pair = [left, right, value]
+				newKernDic[masterID].append(pair)
+				kernIndex.add(masterID, pair)
+				changes.setKerning(masterID, left, right, value)
+				added += 1
+		if dropped:
+			for masterID in newKernDic:
+				newKernDic[masterID] = [pair for pair in newKernDic[masterID] if id(pair) not in dropped]
+		changes.apply()
+	finally:
+		thisFont.enableUpdateInterface()
+		cache.writing = False
+	cache.recordKerning(changes.order)
+	return len(affected), merged, added
 
 
 class RenameKerningGroups(object):
@@ -46,7 +315,7 @@ class RenameKerningGroups(object):
 		spaceX = 10
 		spaceY = 10
 		windowWidth = spaceX * 3 + editX * 2 + 85
-		windowHeight = 150
+		windowHeight = 150 + (editY + spaceY) * 2
 
 		self.w = vanilla.FloatingWindow(
 			(windowWidth, windowHeight),  # default window size
@@ -56,75 +325,118 @@ class RenameKerningGroups(object):
 			autosaveName="com.Tosche.RenameKerningGroups.mainwindow"  # stores last window position and size
 		)
 
+		self.cache = KerningGroupCache()
+		self.cache.refresh()
+
 		# UI elements:
 		self.w.radio = vanilla.RadioGroup((spaceX + 130, spaceY, 120, textY), ["Left", "Right"], isVertical=False, sizeStyle='regular', callback=self.switchList)
 		self.w.radio.set(0)
 		self.w.text1 = vanilla.TextBox((spaceX, spaceY * 2 + textY, 120, textY), "Rename this Group", sizeStyle='regular')
 		self.w.text2 = vanilla.TextBox((spaceX, spaceY * 3 + editY + textY, 120, textY), "to this", sizeStyle='regular')
-		self.w.popup = vanilla.PopUpButton((spaceX + 130, spaceY * 2 + textY, -15, editY), [str(x) for x in sorted(groupsL)], sizeStyle='regular')
+		self.w.popup = vanilla.PopUpButton((spaceX + 130, spaceY * 2 + textY, -15, editY), [str(x) for x in sorted(self.cache.groupsL)], sizeStyle='regular')
 		self.w.newName = vanilla.EditText((spaceX + 130, spaceY * 3 + editY + textY, -15, editY), "", sizeStyle='regular')
+		self.w.text3 = vanilla.TextBox((spaceX, spaceY * 4 + editY * 2 + textY, 120, textY), "If it exists", sizeStyle='regular')
+		self.w.policy = vanilla.PopUpButton((spaceX + 130, spaceY * 4 + editY * 2 + textY, -15, editY), MERGE_POLICIES, sizeStyle='regular')
+		self.w.exceptions = vanilla.CheckBox((spaceX + 130, spaceY * 5 + editY * 3 + textY, -15, editY), "Keep differences as exceptions", value=True, sizeStyle='regular')
 		# Run Button:
-		self.w.runButton = vanilla.Button((-80 - 15, spaceY * 4 + editY * 3, -15, -15), "Run", sizeStyle='regular', callback=self.RenameKerningGroupsMain)
+		self.w.runButton = vanilla.Button((-80 - 15, spaceY * 6 + editY * 5, -15, -15), "Run", sizeStyle='regular', callback=self.RenameKerningGroupsMain)
+		self.w.mappingButton = vanilla.Button((spaceX, spaceY * 6 + editY * 5, 140, -15), "Load Mapping...", sizeStyle='regular', callback=self.loadMapping)
 		self.w.setDefaultButton(self.w.runButton)
+		Glyphs.addCallback(self.fontChanged, UPDATEINTERFACE)
+		self.w.bind("close", self.windowClosed)
 		# Open window and focus on it:
 		self.w.open()
 		self.w.makeKey()
 
+	def fontChanged(self, sender):
+		self.cache.invalidate()
+
+	def windowClosed(self, sender):
+		Glyphs.removeCallback(self.fontChanged)
+
 	def switchList(self, sender):
 		try:
+			self.cache.refresh()
 			if self.w.radio.get() == 0:
-				self.w.popup.setItems(sorted(groupsL))
+				self.w.popup.setItems(sorted(self.cache.groupsL))
 			elif self.w.radio.get() == 1:
-				self.w.popup.setItems(sorted(groupsR))
+				self.w.popup.setItems(sorted(self.cache.groupsR))
 		except Exception as e:
 			print("Rename Kerning Group Error (switchList): %s" % e)
 
+	def currentGroups(self):
+		return self.cache.groupsL if self.w.radio.get() == 0 else self.cache.groupsR
+
 	def RenameKerningGroupsMain(self, sender):
 		try:
-			newName = self.w.newName.get()
-			popupNum = self.w.popup.get()
+			newName = self.w.newName.get().strip()
+			if not newName:
+				Glyphs.showMacroWindow()
+				print("Rename Kerning Groups: type the new name first.")
+				return
+			self.cache.refresh()
+			groups = self.currentGroups()
+			popup = self.w.popup.getItem()
+			if popup not in groups:  # the group is gone since the list was made
+				self.switchList(None)
+				Glyphs.showMacroWindow()
+				print("Rename Kerning Groups: %s is no longer in the font." % popup)
+				return
 			if self.w.radio.get() == 0:  # it it's a left group
-				popup = sorted(groupsL)[popupNum]
-				for thisGlyphName in groupsL[popup]:
-					thisFont.glyphs[thisGlyphName].leftKerningGroup = newName
-				for thisMaster in thisFont.masters:
-					for thisPair in newKernDic[thisMaster.id]:
-						if "@MMK_R_" + popup in thisPair[1]:
-							thisFont.setKerningForPair(thisMaster.id, thisPair[0], "@MMK_R_" + newName, thisPair[2])
-							thisFont.removeKerningForPair(thisMaster.id, thisPair[0], "@MMK_R_" + popup)
-				# updating groupsL popup
-				groupsL[newName] = groupsL.pop(popup)
-				self.w.popup.setItems(sorted(groupsL))
-				self.w.popup.set(sorted(groupsL).index(newName))
-				# updating newKernDic
-				for thisMaster in thisFont.masters:
-					for thisPair in newKernDic[thisMaster.id]:
-						if thisPair[1] == "@MMK_R_" + popup:
-							thisPair[1] = "@MMK_R_" + newName
-
-			if self.w.radio.get() == 1:  # it it's a right group
-				popup = sorted(groupsR)[popupNum]
-				for thisGlyphName in groupsR[popup]:
-					thisFont.glyphs[thisGlyphName].rightKerningGroup = newName
-				for thisMaster in thisFont.masters:
-					for thisPair in newKernDic[thisMaster.id]:
-						if "@MMK_L_" + popup in thisPair[0]:
-							thisFont.setKerningForPair(thisMaster.id, "@MMK_L_" + newName, thisPair[1], thisPair[2])
-							thisFont.removeKerningForPair(thisMaster.id, "@MMK_L_" + popup, thisPair[1])
-				# updating groupsR popup
-				groupsR[newName] = groupsR.pop(popup)
-				self.w.popup.setItems(sorted(groupsR))
-				self.w.popup.set(sorted(groupsR).index(newName))
-				# updating newKernDic
-				for thisMaster in thisFont.masters:
-					for thisPair in newKernDic[thisMaster.id]:
-						if thisPair[0] == "@MMK_L_" + popup:
-							thisPair[0] = "@MMK_L_" + newName
+				result = renameGroups(self.cache, {popup: newName}, {}, self.w.policy.get(), self.w.exceptions.get())
+			else:  # it it's a right group
+				result = renameGroups(self.cache, {}, {popup: newName}, self.w.policy.get(), self.w.exceptions.get())
+			print("Rename Kerning Groups: %s pairs moved, %s merged, %s exceptions added." % result)
+			# updating popup
+			self.w.popup.setItems(sorted(groups))
+			self.w.popup.set(sorted(groups).index(newName))
 
 		except Exception as e:
 			# brings macro window to front and reports error:
 			Glyphs.showMacroWindow()
 			print("Rename Kerning Group Error (RenameKerningGroupsMain): %s" % e)
 
+	def loadMapping(self, sender):
+		# Renames many groups in one go from a CSV file. One rename per line: side, old name, new name.
+		# The side is L or R; empty renames both the left and the right group of that name. Lines starting with # are ignored.
+		try:
+			paths = getFile(fileTypes=["csv", "txt"])
+			if not paths:
+				return
+			with codecs.open(paths[0], "r", "utf-8") as csvFile:
+				text = csvFile.read()
+			self.cache.refresh()
+			groupsL, groupsR = self.cache.groupsL, self.cache.groupsR
+			renamesL = {}
+			renamesR = {}
+			problems = []
+			for lineNumber, fields in enumerate(csv.reader(text.splitlines()), 1):
+				fields = [field.strip() for field in fields]
+				if not fields or not "".join(fields) or fields[0].startswith("#"):
+					continue
+				fields = (fields + ["", "", ""])[:3]
+				side, old, new = fields[0].upper(), fields[1], fields[2]
+				if side not in ("L", "R", "") or not old or not new:
+					problems.append("\tline %s (%s): expected side, old name, new name" % (lineNumber, ", ".join(fields)))
+					continue
+				found = False
+				if side in ("L", "") and old in groupsL:
+					renamesL[old] = new
+					found = True
+				if side in ("R", "") and old in groupsR:
+					renamesR[old] = new
+					found = True
+				if not found:
+					problems.append("\tline %s (%s): no such group" % (lineNumber, ", ".join(fields)))
+			pairCount, mergeCount, exceptionCount = renameGroups(self.cache, renamesL, renamesR, self.w.policy.get(), self.w.exceptions.get())
+			self.switchList(None)
+			print("Rename Kerning Groups: %s left and %s right groups renamed, %s pairs moved, %s merged, %s exceptions added." % (len(renamesL), len(renamesR), pairCount, mergeCount, exceptionCount))
+			if problems:
+				Glyphs.showMacroWindow()
+				print("These lines were skipped:\n%s" % "\n".join(problems))
+		except Exception as e:
+			Glyphs.showMacroWindow()
+			print("Rename Kerning Group Error (loadMapping): %s" % e)
+
 
 RenameKerningGroups()
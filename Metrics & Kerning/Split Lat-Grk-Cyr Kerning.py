@@ -3,20 +3,35 @@
 from __future__ import print_function, division, unicode_literals
 __doc__ = """
 Splits kerning groups of LGC (Latin, Greek, Cyrillic) and reconstructs kerning accordingly.
-Kern once, split later.
+Kern once, split later. More scripts sharing the Latin groups can be added to splitScripts.
 """
 
 from GlyphsApp import Glyphs
+from collections import namedtuple
+import os
+import sys
+scriptFolder = os.path.dirname(os.path.abspath(__file__))  # kerningChanges.py is next to this script
+if scriptFolder not in sys.path:
+	sys.path.append(scriptFolder)
+from kerningChanges import KerningChangeSet
 # import traceback
+GlyphAttributes = namedtuple("GlyphAttributes", ["name", "script", "category", "leftGroup", "rightGroup"])
 
 f = Glyphs.font  # frontmost f
 
-f.disableUpdateInterface()  # suppresses UI updates in f View
+# scripts whose letters get their own groups and kerning, split off the groups they share with Latin.
+# e.g. ["greek", "cyrillic", "armenian", "georgian"]
+splitScripts = ["greek", "cyrillic"]
+# True only reports what the split would do (pairs, groups, estimated GPOS size per master) without changing the font.
+dryRun = False
+
 Glyphs.clearLog()
 
 kernDic = f.kerningDictForDirection_(0)
 newKernDic = {}
+masterNames = {}
 for m in f.masters:
+	masterNames[m.id] = m.name
 	kernList = []
 	for l, rs in kernDic[m.id].items():
 		for r, v in rs.items():
@@ -24,140 +39,209 @@ for m in f.masters:
 			kernList.append(pairInList)
 		newKernDic[m.id] = kernList
 
+# snapshot of the glyph attributes used below, taken before any group changes.
+# keyed by both glyph name and glyph ID, as kerning pairs may use either.
+glyphInfo = {}
+glyphOrder = []
+for g in f.glyphs:
+	glyphOrder.append(g.name)
+	attributes = GlyphAttributes(g.name, g.script, g.category, g.leftKerningGroupId(), g.rightKerningGroupId())
+	glyphInfo[g.name] = attributes
+	glyphInfo[g.id] = attributes
+
 # dictionary of groups, each value containg a list of glyphs involved.
 # groupsL/R[groupName][glyph, glyph, glyph...]
 groupsL = {}
 groupsR = {}
-for g in f.glyphs:
-	if g.category == "Letter":
-		if g.leftKerningGroupId() != None:
-			if not g.leftKerningGroupId() in groupsR:
-				groupsR[g.leftKerningGroupId()] = []
-			groupsR[g.leftKerningGroupId()].append(g.name)
+for gn in glyphOrder:
+	info = glyphInfo[gn]
+	if info.category == "Letter":
+		if info.leftGroup != None:
+			if not info.leftGroup in groupsR:
+				groupsR[info.leftGroup] = []
+			groupsR[info.leftGroup].append(gn)
+
+		if info.rightGroup != None:
+			if not info.rightGroup in groupsL:
+				groupsL[info.rightGroup] = []
+			groupsL[info.rightGroup].append(gn)
+
+groupsL_splitRef = groupsL.copy()
+groupsR_splitRef = groupsR.copy()
 
-		if g.rightKerningGroupId() != None:
-			if not g.rightKerningGroupId() in groupsL:
-				groupsL[g.rightKerningGroupId()] = []
-			groupsL[g.rightKerningGroupId()].append(g.name)
 
-groupsL_GCref = groupsL.copy()
-groupsR_GCref = groupsR.copy()
+# the plan: nothing is written to the font until all of it is known.
+# groupChanges[(glyphName, left, newGroup), ...], and kerningChanges holding the pairs to add and remove
+groupChanges = []
+kerningChanges = KerningChangeSet(f, kernDic)
 
 
 def duplicateGroup(group, left):
 	for groupName, glyphNames in group.items():
-		groupCy = False
-		groupCyName = ""
-		groupGr = False
-		groupGrName = ""
+		# each script's split group is named after its first glyph in the group
+		splitNames = dict((script, "") for script in splitScripts)
 		for gn in glyphNames:
-			if f.glyphs[gn].script == "greek":
-				if groupGr == False:
-					groupGrName = gn
-					groupGr = True
-				if left:
-					f.glyphs[gn].setLeftKerningGroup_(groupGrName)
-				else:
-					f.glyphs[gn].setRightKerningGroup_(groupGrName)
-			elif f.glyphs[gn].script == "cyrillic":
-				if groupCy == False:
-					groupCyName = gn
-					groupCy = True
-				if left:
-					f.glyphs[gn].setLeftKerningGroup_(groupCyName)
-				else:
-					f.glyphs[gn].setRightKerningGroup_(groupCyName)
+			script = glyphInfo[gn].script
+			if script in splitNames:
+				if splitNames[script] == "":
+					splitNames[script] = gn
+				groupChanges.append((gn, left, splitNames[script]))
 		if left:
-			groupsR_GCref[groupName] = ["@MMK_R_" + groupGrName, "@MMK_R_" + groupCyName]
+			groupsR_splitRef[groupName] = ["@MMK_R_" + splitNames[script] for script in splitScripts]
 		else:
-			groupsL_GCref[groupName] = ["@MMK_L_" + groupGrName, "@MMK_L_" + groupCyName]
+			groupsL_splitRef[groupName] = ["@MMK_L_" + splitNames[script] for script in splitScripts]
 
 
 duplicateGroup(groupsL, False)
 duplicateGroup(groupsR, True)
 
 
-def splitToGC(thePair, greek):
-	if greek == True:  # if Greek
-		script = "greek"
-		bin = 0
-	else:
-		script = "cyrillic"
-		bin = 1
-	try:
-		if thePair[0] in groupsL_GCref or thePair[1] in groupsR_GCref:  # if either one of the pair uses group
-			pairL = ""
-			pairR = ""
-			if thePair[0] in groupsL_GCref:
-				if groupsL_GCref[thePair[0]][bin] != "@MMK_L_":
-					pairL = groupsL_GCref[thePair[0]][bin]
-				else:
-					if f.glyphs[groupsL[thePair[0]][0]].category != "Letter":
-						pairL = thePair[0]
-			elif f.glyphs[thePair[0]]:
-				if f.glyphs[thePair[0]].script == script or f.glyphs[thePair[0]].category != "Letter":
-					pairL = thePair[0]
-			else:
-				pairL = thePair[0]
-
-			if thePair[1] in groupsR_GCref:
-				if groupsR_GCref[thePair[1]][bin] != "@MMK_R_":
-					pairR = groupsR_GCref[thePair[1]][bin]
-				else:
-					if f.glyphs[groupsR[thePair[1]][0]].category != "Letter":
-						pairR = thePair[1]
-			elif f.glyphs[thePair[1]]:
-				if f.glyphs[thePair[1]].script == script or f.glyphs[thePair[1]].category != "Letter":
-					pairR = thePair[1]
-			else:
-				pairR = thePair[1]
-
-			if pairL != "" and pairR != "":
-				return pairL, pairR
-			else:
-				return None, None
+def splitKey(key, refs, groups, bin, script):
+	# key of the split for splitScripts[bin], "" if the key has none
+	if key in refs:
+		if refs[key][bin] not in ("@MMK_L_", "@MMK_R_"):
+			return refs[key][bin]
+		if glyphInfo[groups[key][0]].category != "Letter":
+			return key
+		return ""
+	if key in glyphInfo:
+		if glyphInfo[key].script == script or glyphInfo[key].category != "Letter":
+			return key
+		return ""
+	return key
+
+
+def keyNecessity(key, groups):
+	# 0=other script than Latin, 1=non-letter, 2=Latin
+	if key in groups:  # if some kind of letter group
+		if glyphInfo[groups[key][0]].script == "latin":
+			return 2  # definitely Latin
+		return 0
+	if key in glyphInfo:
+		if glyphInfo[key].category == "Letter":
+			if glyphInfo[key].script == "latin":
+				return 2  # definitely Latin here!
+			return 0
+		return 1
+	return 1  # non-letter kerning group
+
+
+# the same keys come back in every master, so each key is translated once:
+# keyTranslations[(key, left)] = ([key for each of splitScripts], usesGroup, necessity)
+keyTranslations = {}
+
+
+def translateKey(key, left):
+	if (key, left) not in keyTranslations:
+		if left:
+			refs, groups = groupsL_splitRef, groupsL
 		else:
-			return None, None
-	except:
-		return None, None
+			refs, groups = groupsR_splitRef, groupsR
+		keyTranslations[(key, left)] = (
+			[splitKey(key, refs, groups, bin, script) for bin, script in enumerate(splitScripts)],
+			key in refs,
+			keyNecessity(key, groups),
+		)
+	return keyTranslations[(key, left)]
 
 
 for mID, pairs in newKernDic.items():
 	for thisPair in pairs:
-		newPairGL, newPairGR = splitToGC(thisPair, True)  # Greek
-		newPairCL, newPairCR = splitToGC(thisPair, False)  # Cyrillic
-		if newPairGL != None:
-			f.setKerningForPair(mID, newPairGL, newPairGR, thisPair[2])
-		if newPairCR != None:
-			f.setKerningForPair(mID, newPairCL, newPairCR, thisPair[2])
+		splitL, groupL, necessityL = translateKey(thisPair[0], True)
+		splitR, groupR, necessityR = translateKey(thisPair[1], False)
+		if groupL or groupR:  # if either one of the pair uses group
+			for newL, newR in zip(splitL, splitR):
+				if newL != "" and newR != "":
+					kerningChanges.setKerning(mID, newL, newR, thisPair[2])
 		# will remove unncessary pairs, like Latin-Greek
-		necessityL = 0  # 0=Greek or Cyrillic, 1=non-letter, 2=Latin
-		necessityR = 0
-		if thisPair[0] in groupsL:  # if left is some kind of letter group
-			if f.glyphs[groupsL[thisPair[0]][0]].script == "latin":
-				necessityL = 2  # definitely Lain
-		elif f.glyphs[thisPair[0]]:
-			if f.glyphs[thisPair[0]].category == "Letter":
-				if f.glyphs[thisPair[0]].script == "latin":
-					necessityL = 2  # definitely Latin here!
-			elif f.glyphs[thisPair[0]].category != "Letter":
-				necessityL = 1
-		else:  # non-letter kerning group
-			necessityL = 1
-
-		if thisPair[1] in groupsR:  # if right is some kind of letter group
-			if f.glyphs[groupsR[thisPair[1]][0]].script == "latin":
-				necessityR = 2
-		elif f.glyphs[thisPair[1]]:
-			if f.glyphs[thisPair[1]].category == "Letter":
-				if f.glyphs[thisPair[1]].script == "latin":
-					necessityR = 2
-			elif f.glyphs[thisPair[1]].category != "Letter":
-				necessityR = 1
-		else:
-			necessityR = 1
-
 		if (necessityL == 0 or necessityR == 0) and (necessityL == 2 or necessityR == 2):
-			f.removeKerningForPair(mID, thisPair[0], thisPair[1])
+			kerningChanges.removeKerning(mID, thisPair[0], thisPair[1])
 
-f.enableUpdateInterface()  # re-enables UI updates in f View
+
+def rollback(changedGlyphs, kerningPending):
+	# puts the groups and kerning values of the snapshot back
+	for gn, left in changedGlyphs:
+		groupId = glyphInfo[gn].leftGroup if left else glyphInfo[gn].rightGroup
+		groupName = groupId[7:] if groupId else None  # strips @MMK_R_ or @MMK_L_
+		if left:
+			f.glyphs[gn].setLeftKerningGroup_(groupName)
+		else:
+			f.glyphs[gn].setRightKerningGroup_(groupName)
+	for mID, l, r, oldValue, newValue in kerningPending:
+		if oldValue is None:
+			f.removeKerningForPair(mID, l, r)
+		else:
+			f.setKerningForPair(mID, l, r, oldValue)
+
+
+def pairPosEstimate(pairs):
+	# rough size of the GPOS PairPos data of one master: pairs with a group on either side make one class matrix
+	# (format 2, class1 x class2 x 2-byte values), glyph-to-glyph pairs go to format 1 (about 4 bytes per pair and per first glyph)
+	classLefts, classRights, glyphLefts = set(), set(), set()
+	glyphPairs = 0
+	for l, r in pairs:
+		if l.startswith("@") or r.startswith("@"):
+			classLefts.add(l)
+			classRights.add(r)
+		else:
+			glyphLefts.add(l)
+			glyphPairs += 1
+	class1, class2 = len(classLefts), len(classRights) + 1  # class 0 holds the glyphs in no class
+	return class1, class2, class1 * class2 * 2, (glyphPairs + len(glyphLefts)) * 4
+
+
+def reportPlan(kerningPending):
+	# pairs and groups after the split, per master, worked out from the snapshot and the plan without touching the font
+	groupsBefore = [set(), set()]
+	groupsAfter = [set(), set()]
+	finalGroups = {}
+	for gn in glyphOrder:
+		for side, groupId in enumerate((glyphInfo[gn].leftGroup, glyphInfo[gn].rightGroup)):
+			groupName = groupId[7:] if groupId else None  # strips @MMK_R_ or @MMK_L_
+			finalGroups[(gn, side == 0)] = groupName
+			if groupName:
+				groupsBefore[side].add(groupName)
+	for gn, left, groupName in groupChanges:
+		finalGroups[(gn, left)] = groupName
+	for (gn, left), groupName in finalGroups.items():
+		if groupName:
+			groupsAfter[0 if left else 1].add(groupName)
+	print("Groups: left %s -> %s, right %s -> %s" % (len(groupsBefore[0]), len(groupsAfter[0]), len(groupsBefore[1]), len(groupsAfter[1])))
+
+	for mID, pairs in newKernDic.items():
+		finalPairs = set((l, r) for l, r, v in pairs)
+		before = len(finalPairs)
+		removed = set((l, r) for m, l, r, oldValue, newValue in kerningPending if m == mID and newValue is None)
+		added = set((l, r) for m, l, r, oldValue, newValue in kerningPending if m == mID and oldValue is None)
+		finalPairs = (finalPairs - removed) | added
+		class1, class2, matrixSize, glyphPairSize = pairPosEstimate(finalPairs)
+		warning = ", over the 64 KB limit of one subtable" if matrixSize > 0xFFFF else ""
+		print("%s: %s pairs -> %s (+%s, -%s). Class matrix %s x %s, about %s bytes%s. Glyph pairs about %s bytes." % (
+			masterNames[mID], before, len(finalPairs), len(added), len(removed), class1, class2, matrixSize, warning, glyphPairSize))
+
+
+kerningPending = kerningChanges.pending()
+reportPlan(kerningPending)
+if dryRun:
+	Glyphs.showMacroWindow()
+	print("Dry run: the font was not changed.")
+else:
+	# applies the plan in one go. if any step fails, everything done so far is rolled back.
+	changedGlyphs = []
+	f.disableUpdateInterface()  # suppresses UI updates in f View
+	try:
+		for gn, left, groupName in groupChanges:
+			changedGlyphs.append((gn, left))
+			if left:
+				f.glyphs[gn].setLeftKerningGroup_(groupName)
+			else:
+				f.glyphs[gn].setRightKerningGroup_(groupName)
+		kerningChanges.apply()
+		added = len([change for change in kerningPending if change[4] is not None])
+		print("Split Lat-Grk-Cyr Kerning (%s): %s group changes, %s pairs set, %s pairs removed." % (", ".join(splitScripts), len(groupChanges), added, len(kerningPending) - added))
+	except Exception as e:
+		rollback(changedGlyphs, kerningPending)
+		Glyphs.showMacroWindow()
+		print("Split Lat-Grk-Cyr Kerning Error: %s\nThe font was put back as it was before the split." % e)
+	finally:
+		f.enableUpdateInterface()  # re-enables UI updates in f View
@@ -0,0 +1,220 @@
+#MenuTitle: Suggest Kerning Groups
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, unicode_literals
+__doc__ = """
+(GUI) Compares the side profiles of glyphs in the current master. Suggests kerning groups of glyphs with near-identical profiles, or reports glyphs that do not match the rest of their group. Vanilla required.
+"""
+
+import vanilla
+from GlyphsApp import Glyphs, GSLowercase
+
+try:
+	import numpy
+except ImportError:
+	numpy = None  # clusterProfiles falls back to plain Python
+
+SAMPLES = 24  # heights measured per side, between the baseline and the x-height (lowercase) or cap height (others)
+MARGIN = 0.05  # part of the zone left out at the top and bottom, where overshoots and accents differ
+REACH = 10000  # how far outside the layer the measuring lines start
+
+
+def normalizeProfile(profile):
+	# Subtracts the smallest distance, so the same shape with different sidebearings matches. None if there is no outline at all
+	present = [value for value in profile if value is not None]
+	if not present:
+		return None
+	low = min(present)
+	return tuple(None if value is None else int(round(value - low)) for value in profile)
+
+
+def sideProfiles(layer, top):
+	# (left, right) distances from each side of the layer to the outline, at SAMPLES heights. None where the line misses the outline
+	left, right = [], []
+	for i in range(SAMPLES):
+		y = top * (MARGIN + (1 - MARGIN * 2) * i / (SAMPLES - 1))
+		points = layer.intersectionsBetweenPoints((-REACH, y), (layer.width + REACH, y), components=True)
+		points = points[1:-1]  # the first and last are the ends of the line
+		if points:
+			left.append(points[0].x)
+			right.append(layer.width - points[-1].x)
+		else:
+			left.append(None)
+			right.append(None)
+	return normalizeProfile(left), normalizeProfile(right)
+
+
+class ProfileCache(object):
+	# Side profiles per layer, kept while the window is open.
+	# A layer is measured again only when its glyph, or a glyph it uses as a component, has changed since.
+	def __init__(self):
+		self.entries = {}
+		self.measured = 0
+
+	def stamp(self, font, glyph, layer, top):
+		componentChanges = []
+		for component in layer.components:
+			baseGlyph = font.glyphs[component.componentName]
+			componentChanges.append(baseGlyph.lastChange if baseGlyph else None)
+		return (glyph.lastChange, layer.width, top, tuple(componentChanges))
+
+	def profiles(self, font, glyph, layer, top):
+		key = (glyph.name, layer.layerId)
+		stamp = self.stamp(font, glyph, layer, top)
+		entry = self.entries.get(key)
+		if entry is None or entry[0] != stamp:
+			entry = (stamp, sideProfiles(layer, top))
+			self.entries[key] = entry
+			self.measured += 1
+		return entry[1]
+
+
+def clusterProfiles(names, profiles, tolerance):
+	# Greedy clustering: each profile joins the first cluster whose first member has the outline at the same heights
+	# and is never more than tolerance away. Returns [[name, ...], ...] in the order of names.
+	clusters = []
+	if numpy is not None and names:
+		matrix = numpy.array([[numpy.nan if value is None else value for value in profiles[name]] for name in names], dtype=float)
+		missing = numpy.isnan(matrix)
+		leaders = []
+		for i, name in enumerate(names):
+			if leaders:
+				leaderRows = numpy.array(leaders)
+				sameHeights = (missing[leaderRows] == missing[i]).all(axis=1)
+				difference = numpy.where(missing[leaderRows], 0, numpy.abs(matrix[leaderRows] - matrix[i]))
+				matches = numpy.flatnonzero(sameHeights & (difference.max(axis=1) <= tolerance))
+				if len(matches):
+					clusters[matches[0]].append(name)
+					continue
+			leaders.append(i)
+			clusters.append([name])
+		return clusters
+	leaders = []
+	for name in names:
+		profile = profiles[name]
+		for leader, cluster in zip(leaders, clusters):
+			if all((a is None) == (b is None) and (a is None or abs(a - b) <= tolerance) for a, b in zip(leader, profile)):
+				cluster.append(name)
+				break
+		else:
+			leaders.append(profile)
+			clusters.append([name])
+	return clusters
+
+
+class SuggestKerningGroups(object):
+	def __init__(self):
+		# Window 'self.w':
+		textY = 19
+		spaceX = 10
+		spaceY = 10
+		buttonX = 90
+		buttonY = 20
+		windowWidth = spaceX * 3 + buttonX * 2 + 120
+		windowHeight = spaceY * 5 + textY * 2 + buttonY
+		self.w = vanilla.FloatingWindow(
+			(windowWidth, windowHeight),  # default window size
+			"Suggest Kerning Groups",  # window title
+		)
+		self.w.radioButton = vanilla.RadioGroup((spaceX, spaceY, 300, textY), ["All Glyphs", "Selected Glyphs"], sizeStyle='regular', isVertical=False)
+		self.w.textTolerance = vanilla.TextBox((spaceX, spaceY * 2 + textY + 2, 140, textY), "Tolerance (units):", sizeStyle='regular')
+		self.w.tolerance = vanilla.EditText((spaceX + 140, spaceY * 2 + textY, 50, textY + 3), "10", sizeStyle='regular')
+		self.w.suggestButton = vanilla.Button((spaceX, spaceY * 4 + textY * 2, buttonX, buttonY), "Suggest", sizeStyle='regular', callback=self.SuggestKerningGroupsMain)
+		self.w.validateButton = vanilla.Button((spaceX * 2 + buttonX, spaceY * 4 + textY * 2, buttonX, buttonY), "Validate", sizeStyle='regular', callback=self.SuggestKerningGroupsMain)
+
+		self.cache = ProfileCache()
+
+		# Open window and focus on it:
+		self.w.open()
+		self.w.radioButton.set(0)
+		self.w.makeKey()
+
+	def collectProfiles(self, font, glyphs):
+		# {"left": {name: profile}, "right": {name: profile}} of the current master, skipping marks and glyphs without outline in the zone
+		master = font.selectedFontMaster
+		profiles = {"left": {}, "right": {}}
+		for glyph in glyphs:
+			if not glyph.export or glyph.category == "Mark":
+				continue
+			top = master.xHeight if glyph.case == GSLowercase else master.capHeight
+			left, right = self.cache.profiles(font, glyph, glyph.layers[master.id], top)
+			if left is not None:
+				profiles["left"][glyph.name] = left
+				profiles["right"][glyph.name] = right
+		return profiles
+
+	def suggest(self, side, clusters, currentGroups):
+		print("\n%s side: %s groups of more than one glyph\n" % (side.capitalize(), len([cluster for cluster in clusters if len(cluster) > 1])))
+		for cluster in clusters:
+			if len(cluster) > 1:
+				now = []
+				for name in cluster:
+					group = currentGroups[name] or "-"
+					if group not in now:
+						now.append(group)
+				print("%s  (now: %s)" % (" ".join(cluster), ", ".join(now)))
+
+	def validate(self, side, clusters, currentGroups):
+		print("\n%s side\n" % side.capitalize())
+		clusterOf = {}
+		for i, cluster in enumerate(clusters):
+			for name in cluster:
+				clusterOf[name] = i
+		membersOf = {}
+		for name in sorted(currentGroups, key=lambda name: clusterOf[name]):
+			if currentGroups[name]:
+				membersOf.setdefault(currentGroups[name], []).append(name)
+		for group in sorted(membersOf):
+			parts = {}
+			for name in membersOf[group]:
+				parts.setdefault(clusterOf[name], []).append(name)
+			if len(parts) > 1:
+				parts = sorted(parts.values(), key=len, reverse=True)
+				print("%s has different profiles: %s" % (group, " | ".join(" ".join(part) for part in parts)))
+		for cluster in clusters:
+			ungrouped = [name for name in cluster if not currentGroups[name]]
+			groups = sorted(set(currentGroups[name] for name in cluster if currentGroups[name]))
+			if ungrouped and len(groups) == 1:
+				print("%s could join %s" % (" ".join(ungrouped), groups[0]))
+
+	def SuggestKerningGroupsMain(self, sender):
+		try:
+			thisFont = Glyphs.font  # frontmost font
+			try:
+				tolerance = float(self.w.tolerance.get())
+			except ValueError:
+				Glyphs.showMacroWindow()
+				print("Suggest Kerning Groups: the tolerance must be a number.")
+				return
+			if self.w.radioButton.get() == 1:  # Selected Glyphs
+				glyphs = []
+				selectedNames = set()
+				for layer in thisFont.selectedLayers:
+					if layer.parent.name not in selectedNames:
+						selectedNames.add(layer.parent.name)
+						glyphs.append(layer.parent)
+			else:
+				glyphs = thisFont.glyphs
+
+			self.cache.measured = 0
+			profiles = self.collectProfiles(thisFont, glyphs)
+			Glyphs.clearLog()
+			Glyphs.showMacroWindow()
+			print("Suggest Kerning Groups: %s glyphs, %s layers measured, the rest from the previous run." % (len(profiles["left"]), self.cache.measured))
+			for side in ("left", "right"):
+				names = list(profiles[side])
+				clusters = clusterProfiles(names, profiles[side], tolerance)
+				if side == "left":
+					currentGroups = dict((name, thisFont.glyphs[name].leftKerningGroup) for name in names)
+				else:
+					currentGroups = dict((name, thisFont.glyphs[name].rightKerningGroup) for name in names)
+				if sender == self.w.validateButton:
+					self.validate(side, clusters, currentGroups)
+				else:
+					self.suggest(side, clusters, currentGroups)
+		except Exception as e:
+			# brings macro window to front and reports error:
+			Glyphs.showMacroWindow()
+			print("Suggest Kerning Groups Error: %s" % e)
+
+
+SuggestKerningGroups()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, unicode_literals
+__doc__ = """
+Shared by the kerning scripts in this folder, which import it from here. Not a script itself, so it has no menu title.
+"""
+
+
+class KerningChangeSet(object):
+	# Collects kerning writes and removals, then applies them in one go. Later entries for the same pair replace earlier ones.
+	# kerning is the current kerning as {masterID: {left: {right: value}}}, e.g. the font's kerning dictionary.
+	# If it is given, entries that would not change it are dropped. Without it, every entry is applied.
+	# kerningKeys maps the names used here to the keys of kerning where they differ, e.g. {glyphName: glyphID} for
+	# kerningDictForDirection_, which keys single glyphs by ID in Glyphs 3. Only the pairs looked up are translated.
+	# changes[masterID][(left, right)] = value, or None for removal
+	def __init__(self, font, kerning=None, kerningKeys=None):
+		self.font = font
+		self.kerning = kerning
+		self.kerningKeys = kerningKeys or {}
+		self.changes = {}
+		self.order = []  # master IDs in the order they were first touched
+
+	def _master(self, mID):
+		if mID not in self.changes:
+			self.changes[mID] = {}
+			self.order.append(mID)
+		return self.changes[mID]
+
+	def setKerning(self, mID, left, right, value):
+		self._master(mID)[(left, right)] = value
+
+	def removeKerning(self, mID, left, right):
+		self._master(mID)[(left, right)] = None
+
+	def currentValue(self, mID, left, right):
+		if self.kerning is None:
+			return None
+		masterKern = self.kerning.get(mID) or {}
+		leftKern = masterKern.get(self.kerningKeys.get(left, left)) or {}
+		return leftKern.get(self.kerningKeys.get(right, right))
+
+	def pending(self):
+		# returns [(masterID, left, right, oldValue, newValue), ...] without duplicates and no-ops
+		pendingList = []
+		for mID in self.order:
+			for (left, right), value in self.changes[mID].items():
+				oldValue = self.currentValue(mID, left, right)
+				if self.kerning is not None:
+					if value == oldValue:
+						continue  # already there, or removing a pair that does not exist
+				pendingList.append((mID, left, right, oldValue, value))
+		return pendingList
+
+	def __len__(self):
+		return len(self.pending())
+
+	def apply(self):
+		pendingList = self.pending()
+		if not pendingList:
+			return 0
+		self.font.disableUpdateInterface()
+		try:
+			for mID, left, right, oldValue, value in pendingList:
+				if value is None:
+					self.font.removeKerningForPair(mID, left, right)
+				else:
+					self.font.setKerningForPair(mID, left, right, value)
+		finally:
+			self.font.enableUpdateInterface()
+		return len(pendingList)
+
+	def diff(self):
+		# compact, human-readable summary of the pending changes, grouped by master
+		pendingList = self.pending()
+		masterNames = dict((m.id, m.name) for m in self.font.masters)
+		counts = {}  # counts[masterID] = [set, removed]
+		for mID, left, right, oldValue, value in pendingList:
+			counts.setdefault(mID, [0, 0])[value is None] += 1
+		lines = []
+		currentMaster = None
+		for mID, left, right, oldValue, value in pendingList:
+			if mID != currentMaster:
+				currentMaster = mID
+				lines.append("%s: %s set, %s removed" % (masterNames.get(mID, mID), counts[mID][0], counts[mID][1]))
+			if value is None:
+				lines.append("\t- %s  %s  (%s)" % (left, right, oldValue))
+			elif oldValue is None:
+				lines.append("\t+ %s  %s  %s" % (left, right, value))
+			else:
+				lines.append("\t~ %s  %s  %s -> %s" % (left, right, oldValue, value))
+		if not lines:
+			lines.append("No kerning changes.")
+		return "\n".join(lines)
+
+	def report(self, dryRun=False):
+		if dryRun:
+			print("Dry run. Nothing has been changed.\n")
+		else:
+			print("Following pairs have been changed.\n")
+		print(self.diff())